@@ -5,16 +5,25 @@ Complete application with multi-agent AI workflow orchestration powered by Gemin
 
 import streamlit as st
 import asyncio
-import json
+import hashlib
+import itertools
+import logging
+import threading
 import time
 import os
+import zlib
+import orjson
+from collections import deque
 from datetime import datetime
+from functools import lru_cache
 from typing import Dict, Any, List
 from dotenv import load_dotenv
 
-# Load environment variables
+# Load environment variables (values already set in the environment take precedence)
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # Page configuration
 st.set_page_config(
     page_title="AI Agentic Workflow Orchestrator",
@@ -38,6 +47,23 @@ st.markdown("""
         color: #2c3e50;
         margin-bottom: 1rem;
     }
+    .status-grid {
+        display: grid;
+        grid-template-columns: repeat(4, 1fr);
+        gap: 1rem;
+    }
+    .metric-grid {
+        display: grid;
+        grid-template-columns: repeat(3, 1fr);
+        gap: 1rem;
+    }
+    .metric-card {
+        background-color: #f8f9fa;
+        padding: 1rem;
+        border-radius: 0.5rem;
+        text-align: center;
+        margin: 0.5rem 0;
+    }
     .status-box {
         padding: 1rem;
         border-radius: 0.5rem;
@@ -59,146 +85,311 @@ st.markdown("""
         background-color: #fff3e0;
         border-left: 4px solid #ff9800;
     }
-    .code-block {
-        background-color: #f5f5f5;
-        padding: 1rem;
-        border-radius: 0.5rem;
-        font-family: 'Courier New', monospace;
-        white-space: pre-wrap;
-    }
-    .metric-card {
-        background-color: #f8f9fa;
-        padding: 1rem;
-        border-radius: 0.5rem;
-        text-align: center;
-        margin: 0.5rem 0;
-    }
 </style>
 """, unsafe_allow_html=True)
 
 # Initialize session state
+# Bounds on how many workflows are kept per session and listed on the history page
+MAX_HISTORY = 50
+HISTORY_PAGE_SIZE = 20
+
 if 'workflow_history' not in st.session_state:
-    st.session_state.workflow_history = []
+    st.session_state.workflow_history = deque(maxlen=MAX_HISTORY)
+if 'workflow_counter' not in st.session_state:
+    st.session_state.workflow_counter = 0
 if 'current_workflow' not in st.session_state:
     st.session_state.current_workflow = None
 if 'gemini_service' not in st.session_state:
     st.session_state.gemini_service = None
+if 'workflow_cache' not in st.session_state:
+    st.session_state.workflow_cache = None
 
-# Import AI agents
-from backend.agents.research_agent import ResearchAgent
-from backend.agents.planning_agent import PlanningAgent
-from backend.agents.execution_agent import ExecutionAgent
+# Minimum cosine similarity for a previous task to count as the same request
+SEMANTIC_CACHE_THRESHOLD = 0.95
+# Workflow results kept per session before the least valuable is evicted
+WORKFLOW_CACHE_SIZE = 100
+
+def get_workflow_cache():
+    """Get this session's workflow result cache, creating it on first use."""
+    if st.session_state.workflow_cache is None:
+        from backend.services.semantic_cache import SemanticCache
+        st.session_state.workflow_cache = SemanticCache(SEMANTIC_CACHE_THRESHOLD, WORKFLOW_CACHE_SIZE)
+    return st.session_state.workflow_cache
 
 # Initialize agents
 @st.cache_resource
 def get_agents():
-    """Get or create AI agents."""
+    """
+    Get or create AI agents.
+    
+    The agents (and the OpenAI SDK behind them) are imported here rather than at
+    module level so pages that never run a workflow don't pay for the import.
+    """
     try:
-        research_agent = ResearchAgent()
-        planning_agent = PlanningAgent()
-        execution_agent = ExecutionAgent()
+        from backend.agents.research_agent import get_research_agent
+        from backend.agents.planning_agent import get_planning_agent
+        from backend.agents.execution_agent import get_execution_agent
+        
+        research_agent = get_research_agent()
+        planning_agent = get_planning_agent()
+        execution_agent = get_execution_agent()
         return research_agent, planning_agent, execution_agent
     except Exception as e:
         st.error(f"Failed to initialize agents: {e}")
         return None, None, None
 
+@lru_cache(maxsize=1)
+def _get_api_key() -> str:
+    """Read the OpenAI API key once per process."""
+    return os.getenv("OPENAI_API_KEY", "")
+
+@st.cache_data(ttl=300)
 def check_openai_api():
-    """Check if OpenAI API is properly configured."""
-    api_key = os.getenv("OPENAI_API_KEY")
+    """Check if OpenAI API is properly configured (re-checked at most every 5 minutes)."""
+    api_key = _get_api_key()
     if not api_key or api_key == "your_api_key_here":
         return False, "OPENAI_API_KEY not configured"
     return True, "API key configured"
 
-async def run_workflow(task: str, context: str = "") -> Dict[str, Any]:
+@st.cache_resource
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """
+    Get the event loop that runs workflows.
+    
+    The loop lives in a background thread for the lifetime of the process, so
+    reruns reuse it (and the connections opened on it) instead of creating and
+    tearing down a loop on every click.
+    """
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, name="workflow-loop", daemon=True).start()
+    return loop
+
+# Spinner text and progress-bar position shown for each workflow phase
+PHASE_LABELS = {
+    "research": "🔍 Research Agent: Analyzing task and generating research questions...",
+    "analysis": "🔬 Research Agent: Answering research questions in parallel...",
+    "combined": "🤖 Combined Agent: Researching, planning and executing in a single pass...",
+    "planning": "📋 Planning Agent: Creating detailed execution plan...",
+    "execution": "⚡ Execution Agent: Generating final deliverables...",
+}
+PHASE_PROGRESS = {"research": 0.1, "analysis": 0.25, "combined": 0.3, "planning": 0.4, "execution": 0.7}
+
+async def stream_phase(stream, progress: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Collect an agent's response into the progress state while it streams.
+    """
+    progress["stream"] = ""
+    async for chunk in stream:
+        progress["stream"] += chunk
+    return stream.result
+
+async def run_workflow(
+    task: str, 
+    context: str, 
+    agents, 
+    progress: Dict[str, Any], 
+    deep_research: bool = False
+) -> Dict[str, Any]:
     """
     Run the complete AI workflow: Research → Planning → Execution
+    
+    With deep_research, every research question is also answered on its own
+    (all in parallel) before planning starts. Otherwise simple tasks are handled
+    by the Combined Agent in a single LLM call.
+    
+    Runs on the background event loop, so it reports through the progress
+    dictionary rather than calling Streamlit directly.
     """
-    start_time = time.time()
+    start_time = time.monotonic()
+    
+    from backend.agents.combined_agent import get_combined_agent, is_simple_task
+    from backend.services.openai_api import request_scope
+    
+    research_agent, planning_agent, execution_agent = agents
+    if not all([research_agent, planning_agent, execution_agent]):
+        raise Exception("Failed to initialize agents")
+    
+    # Identical LLM requests within this run are only sent once
+    with request_scope():
+        combined_results = None
+        if not deep_research and is_simple_task(task, context):
+            # Simple tasks get all three results from a single LLM call
+            progress["phase"] = "combined"
+            try:
+                combined_results = await get_combined_agent().process(task, context)
+            except Exception as e:
+                logger.warning(f"Combined Agent failed, falling back to separate agents: {e}")
+        
+        if combined_results is not None:
+            research_results, planning_results, execution_results = combined_results
+        else:
+            # Phase 1: Research Agent
+            progress["phase"] = "research"
+            research_results = await stream_phase(research_agent.stream_process(task, context), progress)
+            
+            if deep_research:
+                progress["phase"] = "analysis"
+                research_results["question_analyses"] = await research_agent.analyze_questions(task, research_results)
+            
+            # Summarize the research once for both later phases
+            research_summary = research_agent.summarize(research_results)
+            
+            # Phase 2: Planning Agent
+            progress["phase"] = "planning"
+            planning_results = await stream_phase(
+                planning_agent.stream_process(task, research_results, research_summary=research_summary),
+                progress
+            )
+            
+            # Phase 3: Execution Agent
+            progress["phase"] = "execution"
+            execution_results = await stream_phase(execution_agent.stream_process(
+                task, research_results, planning_results, research_summary=research_summary
+            ), progress)
+    
+    total_duration = time.monotonic() - start_time
+    
+    return {
+        "status": "completed",
+        "research_results": research_results,
+        "planning_results": planning_results,
+        "execution_results": execution_results,
+        "total_duration": total_duration,
+        "deep_research": deep_research
+    }
+
+def workflow_cache_key(task: str, context: str, deep_research: bool = False) -> str:
+    """Build the exact-match cache key for a normalized (task, context) pair."""
+    normalized = task.strip().lower() + "\0" + context.strip().lower() + "\0" + str(deep_research)
+    return hashlib.sha256(normalized.encode()).hexdigest()
+
+async def run_cached_workflow(
+    task: str, 
+    context: str, 
+    agents, 
+    cache, 
+    progress: Dict[str, Any],
+    deep_research: bool = False
+) -> Dict[str, Any]:
+    """
+    Run the workflow, reusing a previous result for the same or a near-identical task.
     
+    Exact matches are looked up by the normalized (task, context) hash. Otherwise the
+    request is embedded and compared against earlier requests by cosine similarity.
+    """
+    key = workflow_cache_key(task, context, deep_research)
+    namespace = str(deep_research)
+    cached = cache.get(key)
+    if cached is not None:
+        return {**cached, "cache_hit": "exact"}
+    
+    research_agent = agents[0]
+    
+    embedding = None
     try:
-        # Get agents
-        research_agent, planning_agent, execution_agent = get_agents()
-        if not all([research_agent, planning_agent, execution_agent]):
-            raise Exception("Failed to initialize agents")
-        
-        # Phase 1: Research Agent
-        with st.spinner("🔍 Research Agent: Analyzing task and generating research questions..."):
-            research_results = await research_agent.process(task, context)
-        
-        # Phase 2: Planning Agent
-        with st.spinner("📋 Planning Agent: Creating detailed execution plan..."):
-            planning_results = await planning_agent.process(task, research_results)
-        
-        # Phase 3: Execution Agent
-        with st.spinner("⚡ Execution Agent: Generating final deliverables..."):
-            execution_results = await execution_agent.process(task, research_results, planning_results)
-        
-        total_duration = time.time() - start_time
-        
-        return {
-            "status": "completed",
-            "research_results": research_results,
-            "planning_results": planning_results,
-            "execution_results": execution_results,
-            "total_duration": total_duration
-        }
-        
+        embedding = await research_agent.openai_service.generate_embedding(f"{task}\n\n{context}".strip())
+        cached = cache.search(embedding, namespace)
+        if cached is not None:
+            return {**cached, "cache_hit": "semantic"}
+    except Exception as e:
+        # The semantic lookup is best-effort; fall back to running the workflow
+        logger.warning(f"Semantic cache lookup skipped: {e}")
+    
+    result = await run_workflow(task, context, agents, progress, deep_research)
+    cache.put(key, result, embedding, namespace, cost=result["total_duration"])
+    return result
+
+def execute_workflow(task: str, context: str, deep_research: bool = False) -> Dict[str, Any]:
+    """
+    Run the workflow on the background loop, rendering streamed output until it finishes.
+    
+    The script thread only polls, so Streamlit stays responsive: pressing Cancel
+    triggers a rerun, which interrupts the polling loop and cancels the workflow.
+    """
+    progress = {"phase": None, "stream": ""}
+    future = asyncio.run_coroutine_threadsafe(
+        run_cached_workflow(
+            task, context, get_agents(), get_workflow_cache(), progress, deep_research
+        ),
+        get_event_loop()
+    )
+    
+    cancel_button = st.empty()
+    cancel_button.button("✖️ Cancel", key="cancel_workflow", use_container_width=True)
+    progress_bar = st.progress(0.0)
+    preview = st.empty()
+    # Only the cheap progress bar is redrawn on every poll: Streamlit can only
+    # stop the script (and so honour Cancel) at an st call. The preview is
+    # re-rendered only when it changed.
+    last_phase, last_length = None, -1
+    try:
+        while not future.done():
+            phase, stream = progress["phase"], progress["stream"]
+            if phase:
+                progress_bar.progress(PHASE_PROGRESS[phase], text=PHASE_LABELS[phase])
+            else:
+                progress_bar.progress(0.0)
+            if phase and (phase != last_phase or len(stream) != last_length):
+                preview.code(stream, language="json")
+            last_phase, last_length = phase, len(stream)
+            time.sleep(0.1)
+    finally:
+        # Reached early when Streamlit interrupts the run (Cancel, or any other widget)
+        if not future.done():
+            future.cancel()
+    cancel_button.empty()
+    progress_bar.empty()
+    preview.empty()
+    
+    try:
+        return future.result()
     except Exception as e:
         st.error(f"Workflow failed: {str(e)}")
         return None
 
+def compress_result(result: Dict[str, Any]) -> bytes:
+    """Serialize a workflow result to compressed JSON for storage in history."""
+    return zlib.compress(orjson.dumps(result))
+
+def decompress_result(blob: bytes) -> Dict[str, Any]:
+    """Restore a workflow result stored by compress_result."""
+    return orjson.loads(zlib.decompress(blob))
+
+def workflow_metrics(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Extract the quick metrics shown on the history page."""
+    return {
+        "duration": result.get('total_duration', 0),
+        "research_questions": len(result.get('research_results', {}).get('research_questions', [])),
+        "execution_steps": len(result.get('planning_results', {}).get('detailed_steps', []))
+    }
+
+# Emoji and alert style for high/medium/low priority, complexity and effort values
+PRIORITY_EMOJI = {'high': '🔴', 'medium': '🟡', 'low': '🟢'}
+LEVEL_RENDER = {'high': (st.error, '🔴'), 'medium': (st.warning, '🟡'), 'low': (st.success, '🟢')}
+
+def render_level(level: str):
+    """Show a high/medium/low value as a colored alert."""
+    renderer, emoji = LEVEL_RENDER.get(level, (st.info, '⚪'))
+    renderer(f"{emoji} {level.title()}")
+
+# Status boxes and metric cards for a finished workflow, rendered as a single markdown block
+PROGRESS_HTML = """
+<div class="status-grid">
+    <div class="status-box status-research"><h4>🔍 Research Phase</h4><p>✓ Completed</p></div>
+    <div class="status-box status-planning"><h4>📋 Planning Phase</h4><p>✓ Completed</p></div>
+    <div class="status-box status-execution"><h4>⚡ Execution Phase</h4><p>✓ Completed</p></div>
+    <div class="status-box status-complete"><h4>🎯 Complete</h4><p>✓ Workflow Finished</p></div>
+</div>
+<div class="metric-grid">
+    <div class="metric-card"><p>Total Duration</p><h3>{duration:.2f}s</h3></div>
+    <div class="metric-card"><p>Research Questions</p><h3>{research_questions}</h3></div>
+    <div class="metric-card"><p>Execution Steps</p><h3>{execution_steps}</h3></div>
+</div>
+"""
+
 def display_workflow_progress(workflow_data: Dict[str, Any]):
     """Display workflow progress and results."""
-    
-    # Progress indicators
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        st.markdown("""
-        <div class="status-box status-research">
-            <h4>🔍 Research Phase</h4>
-            <p>✓ Completed</p>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col2:
-        st.markdown("""
-        <div class="status-box status-planning">
-            <h4>📋 Planning Phase</h4>
-            <p>✓ Completed</p>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col3:
-        st.markdown("""
-        <div class="status-box status-execution">
-            <h4>⚡ Execution Phase</h4>
-            <p>✓ Completed</p>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col4:
-        st.markdown("""
-        <div class="status-box status-complete">
-            <h4>🎯 Complete</h4>
-            <p>✓ Workflow Finished</p>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    # Metrics
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        duration = workflow_data.get('total_duration', 0)
-        st.metric("Total Duration", f"{duration:.2f}s")
-    
-    with col2:
-        research_questions = len(workflow_data.get('research_results', {}).get('research_questions', []))
-        st.metric("Research Questions", research_questions)
-    
-    with col3:
-        execution_steps = len(workflow_data.get('planning_results', {}).get('detailed_steps', []))
-        st.metric("Execution Steps", execution_steps)
+    st.markdown(PROGRESS_HTML.format(**workflow_metrics(workflow_data)), unsafe_allow_html=True)
 
 def display_research_results(research_data: Dict[str, Any]):
     """Display research phase results."""
@@ -215,27 +406,25 @@ def display_research_results(research_data: Dict[str, Any]):
         with col2:
             st.write("**Complexity Level:**")
             complexity = analysis.get('complexity_level', 'N/A')
-            if complexity == 'high':
-                st.error(f"🔴 {complexity.title()}")
-            elif complexity == 'medium':
-                st.warning(f"🟡 {complexity.title()}")
-            else:
-                st.success(f"🟢 {complexity.title()}")
+            render_level(complexity)
     
     if 'research_questions' in research_data:
-        st.write("**Research Questions:**")
         questions = research_data['research_questions']
-        for i, q in enumerate(questions, 1):
-            priority_color = {
-                'high': '🔴',
-                'medium': '🟡', 
-                'low': '🟢'
-            }.get(q.get('priority', 'medium'), '⚪')
-            
-            st.write(f"{i}. {priority_color} **{q.get('question', 'N/A')}**")
-            st.write(f"   Category: {q.get('category', 'N/A')} | Priority: {q.get('priority', 'N/A')}")
-            st.write(f"   Rationale: {q.get('rationale', 'N/A')}")
-            st.divider()
+        st.markdown("**Research Questions:**\n\n" + "\n\n---\n\n".join(
+            f"{i}. {PRIORITY_EMOJI.get(q.get('priority', 'medium'), '⚪')} **{q.get('question', 'N/A')}**  \n"
+            f"   Category: {q.get('category', 'N/A')} | Priority: {q.get('priority', 'N/A')}  \n"
+            f"   Rationale: {q.get('rationale', 'N/A')}"
+            for i, q in enumerate(questions, 1)
+        ))
+    
+    if 'question_analyses' in research_data:
+        with st.expander("🔬 Question Analyses", expanded=False):
+            st.markdown("\n\n---\n\n".join(
+                f"**{analysis.get('question', 'N/A')}**\n\n"
+                + "".join(f"- {finding}\n" for finding in analysis.get('findings', []))
+                + f"\nRecommendation: {analysis.get('recommendation', 'N/A')}"
+                for analysis in research_data['question_analyses']
+            ))
 
 def display_planning_results(planning_data: Dict[str, Any]):
     """Display planning phase results."""
@@ -252,31 +441,27 @@ def display_planning_results(planning_data: Dict[str, Any]):
         with col2:
             st.write("**Estimated Effort:**")
             effort = plan.get('total_estimated_effort', 'N/A')
-            if effort == 'high':
-                st.error(f"🔴 {effort.title()}")
-            elif effort == 'medium':
-                st.warning(f"🟡 {effort.title()}")
-            else:
-                st.success(f"🟢 {effort.title()}")
+            render_level(effort)
     
     if 'phases' in planning_data:
-        st.write("**Execution Phases:**")
         phases = planning_data['phases']
-        for phase in phases:
-            st.write(f"**Phase {phase.get('phase_number', 'N/A')}: {phase.get('phase_name', 'N/A')}**")
-            st.write(f"Description: {phase.get('description', 'N/A')}")
-            st.write(f"Duration: {phase.get('estimated_duration', 'N/A')}")
-            st.divider()
+        st.markdown("**Execution Phases:**\n\n" + "\n\n---\n\n".join(
+            f"**Phase {phase.get('phase_number', 'N/A')}: {phase.get('phase_name', 'N/A')}**  \n"
+            f"Description: {phase.get('description', 'N/A')}  \n"
+            f"Duration: {phase.get('estimated_duration', 'N/A')}"
+            for phase in phases
+        ))
     
     if 'detailed_steps' in planning_data:
         with st.expander("📝 Detailed Steps", expanded=False):
             steps = planning_data['detailed_steps']
-            for step in steps:
-                st.write(f"**Step {step.get('step_number', 'N/A')}: {step.get('title', 'N/A')}**")
-                st.write(f"Phase: {step.get('phase', 'N/A')}")
-                st.write(f"Description: {step.get('description', 'N/A')}")
-                st.write(f"Effort: {step.get('effort_estimate', 'N/A')}")
-                st.divider()
+            st.markdown("\n\n---\n\n".join(
+                f"**Step {step.get('step_number', 'N/A')}: {step.get('title', 'N/A')}**  \n"
+                f"Phase: {step.get('phase', 'N/A')}  \n"
+                f"Description: {step.get('description', 'N/A')}  \n"
+                f"Effort: {step.get('effort_estimate', 'N/A')}"
+                for step in steps
+            ))
 
 def display_execution_results(execution_data: Dict[str, Any]):
     """Display execution phase results."""
@@ -292,23 +477,21 @@ def display_execution_results(execution_data: Dict[str, Any]):
         st.success(summary.get('solution_overview', 'N/A'))
         
         if 'key_insights' in summary:
-            st.write("**Key Insights:**")
-            for insight in summary['key_insights']:
-                st.write(f"• {insight}")
+            st.markdown("**Key Insights:**\n\n" + "".join(
+                f"- {insight}\n" for insight in summary['key_insights']
+            ))
     
     if 'deliverables' in execution_data:
         st.write("**Deliverables:**")
         deliverables = execution_data['deliverables']
         for deliverable in deliverables:
-            priority_color = {
-                'high': '🔴',
-                'medium': '🟡',
-                'low': '🟢'
-            }.get(deliverable.get('priority', 'medium'), '⚪')
+            priority_color = PRIORITY_EMOJI.get(deliverable.get('priority', 'medium'), '⚪')
             
-            st.write(f"{priority_color} **{deliverable.get('title', 'N/A')}**")
-            st.write(f"Type: {deliverable.get('type', 'N/A')}")
-            st.write(f"Description: {deliverable.get('description', 'N/A')}")
+            st.markdown(
+                f"{priority_color} **{deliverable.get('title', 'N/A')}**  \n"
+                f"Type: {deliverable.get('type', 'N/A')}  \n"
+                f"Description: {deliverable.get('description', 'N/A')}"
+            )
             
             if deliverable.get('format') == 'code':
                 st.code(deliverable.get('content', ''), language='python')
@@ -321,19 +504,22 @@ def display_execution_results(execution_data: Dict[str, Any]):
         with st.expander("💻 Code Templates", expanded=False):
             templates = execution_data['code_templates']
             for template in templates:
-                st.write(f"**{template.get('purpose', 'N/A')}**")
-                st.write(f"Language: {template.get('language', 'N/A')}")
-                st.write(f"Filename: {template.get('filename', 'N/A')}")
+                st.markdown(
+                    f"**{template.get('purpose', 'N/A')}**  \n"
+                    f"Language: {template.get('language', 'N/A')}  \n"
+                    f"Filename: {template.get('filename', 'N/A')}"
+                )
                 st.code(template.get('code', ''), language=template.get('language', 'text'))
                 st.divider()
     
     if 'next_steps' in execution_data:
-        st.write("**Next Steps:**")
         next_steps = execution_data['next_steps']
-        for i, step in enumerate(next_steps, 1):
-            st.write(f"{i}. **{step.get('action', 'N/A')}**")
-            st.write(f"   Timeline: {step.get('timeline', 'N/A')}")
-            st.write(f"   Owner: {step.get('owner', 'N/A')}")
+        st.markdown("**Next Steps:**\n\n" + "\n".join(
+            f"{i}. **{step.get('action', 'N/A')}**  \n"
+            f"   Timeline: {step.get('timeline', 'N/A')}  \n"
+            f"   Owner: {step.get('owner', 'N/A')}"
+            for i, step in enumerate(next_steps, 1)
+        ))
 
 def show_workflow_page():
     """Display the main workflow page."""
@@ -360,50 +546,71 @@ def show_workflow_page():
         height=80
     )
     
+    deep_research = st.checkbox(
+        "Deep research (answer each research question before planning)",
+        help="Runs one extra LLM call per research question, all in parallel."
+    )
+    
     col1, col2, col3 = st.columns([1, 1, 1])
     
     with col2:
+        if st.session_state.get("cancel_workflow"):
+            st.warning("Workflow cancelled.")
+        
         if st.button("🚀 Execute Workflow", type="primary", use_container_width=True):
             if not task.strip():
                 st.error("Please enter a task to execute.")
                 return
             
             # Execute workflow
-            workflow_result = asyncio.run(run_workflow(task, context))
+            workflow_result = execute_workflow(task, context, deep_research)
             
             if workflow_result:
                 # Store in history
+                st.session_state.workflow_counter += 1
                 workflow_entry = {
-                    "id": len(st.session_state.workflow_history) + 1,
+                    "id": st.session_state.workflow_counter,
                     "task": task,
                     "context": context,
-                    "timestamp": datetime.now().isoformat(),
-                    "result": workflow_result
+                    "timestamp": datetime.now().isoformat()
                 }
-                st.session_state.workflow_history.append(workflow_entry)
-                st.session_state.current_workflow = workflow_entry
+                st.session_state.workflow_history.append({
+                    **workflow_entry,
+                    "metrics": workflow_metrics(workflow_result),
+                    "result_blob": compress_result(workflow_result)
+                })
+                st.session_state.current_workflow = {**workflow_entry, "result": workflow_result}
                 
+                if workflow_result.get("cache_hit"):
+                    st.info("♻️ Returned a cached result for a matching task.")
                 st.success("✅ Workflow completed successfully!")
-                st.rerun()
     
-    # Display current workflow results
+    # Display current workflow results (rendered in this run, no rerun needed)
     if st.session_state.current_workflow:
         st.header("📊 Current Workflow Results")
         
-        workflow_data = st.session_state.current_workflow['result']
-        
-        # Display progress
-        display_workflow_progress(workflow_data)
-        
-        # Display results by phase
-        if 'research_results' in workflow_data:
-            display_research_results(workflow_data['research_results'])
-        
-        if 'planning_results' in workflow_data:
-            display_planning_results(workflow_data['planning_results'])
-        
-        if 'execution_results' in workflow_data:
-            display_execution_results(workflow_data['execution_results'])
+        show_results(st.session_state.current_workflow['result'])
+
+@st.fragment
+def show_results(workflow_data: Dict[str, Any]):
+    """
+    Display the progress summary and per-phase results of a workflow.
+    
+    Runs as a fragment, so interacting with widgets inside the results only
+    reruns this panel rather than the whole page.
+    """
+    # Display progress
+    display_workflow_progress(workflow_data)
+    
+    # Display results by phase
+    if 'research_results' in workflow_data:
+        display_research_results(workflow_data['research_results'])
+    
+    if 'planning_results' in workflow_data:
+        display_planning_results(workflow_data['planning_results'])
+    
+    if 'execution_results' in workflow_data:
+        display_execution_results(workflow_data['execution_results'])
 
 def show_history_page():
     """Display the workflow history page."""
@@ -414,8 +621,17 @@ def show_history_page():
         st.info("No workflows in history yet. Execute a workflow to see results here.")
         return
     
+    show_history_list()
+
+@st.fragment
+def show_history_list():
+    """Display the most recent workflows, rerunning only this list on interaction."""
+    history = st.session_state.workflow_history
+    if len(history) > HISTORY_PAGE_SIZE:
+        st.caption(f"Showing the {HISTORY_PAGE_SIZE} most recent of {len(history)} workflows.")
+    
     # Display history
-    for i, workflow in enumerate(reversed(st.session_state.workflow_history)):
+    for workflow in itertools.islice(reversed(history), HISTORY_PAGE_SIZE):
         with st.expander(f"Workflow #{workflow['id']} - {workflow['task'][:50]}...", expanded=False):
             st.write(f"**Task:** {workflow['task']}")
             if workflow['context']:
@@ -423,24 +639,25 @@ def show_history_page():
             st.write(f"**Timestamp:** {workflow['timestamp']}")
             
             # Quick metrics
-            result = workflow['result']
+            metrics = workflow['metrics']
             col1, col2, col3 = st.columns(3)
             
             with col1:
-                duration = result.get('total_duration', 0)
-                st.metric("Duration", f"{duration:.2f}s")
+                st.metric("Duration", f"{metrics['duration']:.2f}s")
             
             with col2:
-                research_questions = len(result.get('research_results', {}).get('research_questions', []))
-                st.metric("Research Qs", research_questions)
+                st.metric("Research Qs", metrics['research_questions'])
             
             with col3:
-                execution_steps = len(result.get('planning_results', {}).get('detailed_steps', []))
-                st.metric("Steps", execution_steps)
+                st.metric("Steps", metrics['execution_steps'])
             
-            # View full results button
-            if st.button(f"View Full Results", key=f"view_{i}"):
-                st.session_state.current_workflow = workflow
+            # View full results button (results are only decompressed here)
+            if st.button(f"View Full Results", key=f"view_{workflow['id']}"):
+                st.session_state.current_workflow = {
+                    key: value for key, value in workflow.items()
+                    if key not in ("metrics", "result_blob")
+                }
+                st.session_state.current_workflow["result"] = decompress_result(workflow["result_blob"])
                 st.rerun()
 
 def show_about_page():
@@ -475,7 +692,7 @@ def show_about_page():
     
     - **Frontend**: Streamlit
     - **AI**: OpenAI API
-    - **Language**: Python 3.8+
+    - **Language**: Python 3.10+
     - **Architecture**: Multi-agent orchestration
     
     ## Getting Started
@@ -516,8 +733,9 @@ def main():
         st.write(f"Workflows in History: {len(st.session_state.workflow_history)}")
         
         if st.button("🗑️ Clear History"):
-            st.session_state.workflow_history = []
+            st.session_state.workflow_history = deque(maxlen=MAX_HISTORY)
             st.session_state.current_workflow = None
+            st.session_state.workflow_cache = None
             st.rerun()
     
     # Page routing
@@ -3,8 +3,27 @@ AI Agents Package
 Contains the three main agents: Research, Planning, and Execution.
 """
 
-from .research_agent import ResearchAgent
-from .planning_agent import PlanningAgent
-from .execution_agent import ExecutionAgent
+from importlib import import_module
+from typing import TYPE_CHECKING
 
-__all__ = ['ResearchAgent', 'PlanningAgent', 'ExecutionAgent']
+if TYPE_CHECKING:
+    from .research_agent import ResearchAgent
+    from .planning_agent import PlanningAgent
+    from .execution_agent import ExecutionAgent
+    from .combined_agent import CombinedAgent
+
+__all__ = ['ResearchAgent', 'PlanningAgent', 'ExecutionAgent', 'CombinedAgent']
+
+# Agents are imported on first access so importing one agent module
+# doesn't load the others
+_AGENT_MODULES = {
+    'ResearchAgent': '.research_agent',
+    'PlanningAgent': '.planning_agent',
+    'ExecutionAgent': '.execution_agent',
+    'CombinedAgent': '.combined_agent',
+}
+
+def __getattr__(name):
+    if name in _AGENT_MODULES:
+        return getattr(import_module(_AGENT_MODULES[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,87 @@
+"""
+Agent Summaries Module
+Condense agent outputs into the text handed to the next agent's prompt.
+"""
+
+import logging
+from typing import Dict, Any, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def _iter_research_summary(research_results: Dict[str, Any], max_questions: int) -> Iterator[str]:
+    """Yield the summary lines for research results."""
+    if (analysis := research_results.get("task_analysis")):
+        yield f"Main Objective: {analysis.get('main_objective', 'N/A')}"
+        yield f"Key Domains: {', '.join(analysis.get('key_domains', []))}"
+        yield f"Complexity: {analysis.get('complexity_level', 'N/A')}"
+
+    if (questions := research_results.get("research_questions")):
+        yield f"\nResearch Questions ({len(questions)} total):"
+        for i, q in enumerate(questions[:max_questions], 1):
+            yield f"{i}. {q.get('question', 'N/A')} ({q.get('priority', 'N/A')} priority)"
+
+    if (areas := research_results.get("research_areas")):
+        yield f"\nResearch Areas ({len(areas)} total):"
+        for area in areas:
+            yield f"- {area.get('area', 'N/A')}: {area.get('description', 'N/A')}"
+
+    # Per-question analyses only exist for deep research runs
+    if (analyses := research_results.get("question_analyses")):
+        yield f"\nQuestion Analyses ({len(analyses)} total):"
+        for analysis in analyses:
+            yield f"- {analysis.get('question', 'N/A')}: {analysis.get('recommendation', 'N/A')}"
+
+
+def _iter_planning_summary(planning_results: Dict[str, Any], max_steps: Optional[int]) -> Iterator[str]:
+    """Yield the summary lines for planning results."""
+    if (plan := planning_results.get("execution_plan")):
+        yield f"Plan Overview: {plan.get('overview', 'N/A')}"
+        yield f"Estimated Effort: {plan.get('total_estimated_effort', 'N/A')}"
+        yield f"Timeline: {plan.get('estimated_timeline', 'N/A')}"
+
+    if (phases := planning_results.get("phases")):
+        yield f"\nExecution Phases ({len(phases)} total):"
+        for phase in phases:
+            yield f"- Phase {phase.get('phase_number', 'N/A')}: {phase.get('phase_name', 'N/A')}"
+
+    if (steps := planning_results.get("detailed_steps")):
+        yield f"\nDetailed Steps ({len(steps)} total):"
+        for i, step in enumerate(steps[:max_steps], 1):
+            yield f"{i}. {step.get('title', 'N/A')}"
+
+
+def summarize_research(research_results: Dict[str, Any], max_questions: int = 5) -> str:
+    """
+    Extract and format key information from research results.
+
+    Args:
+        research_results: Output from Research Agent
+        max_questions: Number of research questions to list
+
+    Returns:
+        Formatted summary string (a placeholder if the results are malformed)
+    """
+    try:
+        return "\n".join(_iter_research_summary(research_results, max_questions))
+    except Exception as e:
+        logger.warning(f"Failed to extract research summary: {e}")
+        return "Research results available but summary extraction failed"
+
+
+def summarize_planning(planning_results: Dict[str, Any], max_steps: Optional[int] = 5) -> str:
+    """
+    Extract and format key information from planning results.
+
+    Args:
+        planning_results: Output from Planning Agent
+        max_steps: Number of detailed steps to list (None for all)
+
+    Returns:
+        Formatted summary string (a placeholder if the results are malformed)
+    """
+    try:
+        return "\n".join(_iter_planning_summary(planning_results, max_steps))
+    except Exception as e:
+        logger.warning(f"Failed to extract planning summary: {e}")
+        return "Planning results available but summary extraction failed"
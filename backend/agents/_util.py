@@ -0,0 +1,11 @@
+"""
+Agent Utilities Module
+Small helpers shared by the agents.
+"""
+
+from datetime import datetime
+
+
+def now_iso() -> str:
+    """Get the current local time as an ISO 8601 string for metadata."""
+    return datetime.now().isoformat(timespec="seconds")
@@ -0,0 +1,242 @@
+"""
+Combined Agent Module
+Runs research, planning and execution for simple tasks in a single LLM call.
+"""
+
+import functools
+import logging
+import os
+from typing import Dict, Any, Tuple
+from ._summaries import summarize_planning
+from .research_agent import ResearchAgent, get_research_agent
+from .planning_agent import PlanningAgent, get_planning_agent
+from .execution_agent import ExecutionAgent, get_execution_agent
+
+logger = logging.getLogger(__name__)
+
+# Tasks up to this many words (task and context together) take the single-call path
+SIMPLE_TASK_MAX_WORDS = int(os.getenv("SIMPLE_TASK_MAX_WORDS", "12"))
+
+def is_simple_task(task: str, context: str = "") -> bool:
+    """
+    Decide whether a task is small enough for the single-call path.
+    
+    A word-count heuristic rather than an extra LLM classification call, so
+    the decision itself costs nothing.
+    
+    Args:
+        task: The main task or problem statement from the user
+        context: Additional context or background information
+    
+    Returns:
+        True if the task should be handled by CombinedAgent
+    """
+    return len(task.split()) + len(context.split()) <= SIMPLE_TASK_MAX_WORDS
+
+# User prompt for a combined request, filled in by _build_prompt
+_PROMPT_TEMPLATE = """
+TASK: {task}
+
+{context}
+
+{instruction}
+"""
+
+# Closing instruction for the research + planning + execution request
+_FULL_INSTRUCTION = """Research this task, create an execution plan from your research, and deliver the final
+output from both, following the structure specified in the system prompt."""
+
+# Closing instruction for the research + planning request
+_RESEARCH_PLAN_INSTRUCTION = """Research this task and create an execution plan from your research,
+following the structure specified in the system prompt."""
+
+class CombinedAgent:
+    """
+    Combined Agent producing all three agents' outputs from one request.
+    
+    The three agents' output structures are sent as one system prompt and the
+    model answers with a single JSON object holding a section for each, so the
+    task is sent (and prefilled) once instead of three times. Each section is
+    then returned exactly as the corresponding agent would return it.
+    """
+    
+    def __init__(
+        self, 
+        research_agent: ResearchAgent, 
+        planning_agent: PlanningAgent, 
+        execution_agent: ExecutionAgent
+    ):
+        """
+        Initialize the Combined Agent.
+        
+        Args:
+            research_agent: Agent whose output structure fills the "research" section
+            planning_agent: Agent whose output structure fills the "planning" section
+            execution_agent: Agent whose output structure fills the "execution" section
+        """
+        self.research_agent = research_agent
+        self.planning_agent = planning_agent
+        self.execution_agent = execution_agent
+        self.openai_service = research_agent.openai_service
+        
+        # System prompt for the combined agent, built from the three agents' prompts
+        self.system_prompt = f"""
+You are running the Research, Planning and Execution Agents of an AI Agentic Workflow
+Orchestrator in a single pass. Work through them in order: plan from your research,
+then execute from your research and plan.
+
+Your output should be a single JSON object with the following structure:
+{{
+    "research": {{ ...Research Agent output... }},
+    "planning": {{ ...Planning Agent output... }},
+    "execution": {{ ...Execution Agent output... }}
+}}
+
+Each section must follow the structure described for its agent below.
+
+=== RESEARCH AGENT ===
+{research_agent.system_prompt}
+=== PLANNING AGENT ===
+{planning_agent.system_prompt}
+=== EXECUTION AGENT ===
+{execution_agent.system_prompt}
+"""
+        
+        # System prompt for the fused research + planning request
+        self.research_plan_system_prompt = f"""
+You are running the Research and Planning Agents of an AI Agentic Workflow Orchestrator
+in a single pass. Research the task first, then plan from your research.
+
+Your output should be a single JSON object with the following structure:
+{{
+    "research": {{ ...Research Agent output... }},
+    "planning": {{ ...Planning Agent output... }}
+}}
+
+Each section must follow the structure described for its agent below.
+
+=== RESEARCH AGENT ===
+{research_agent.system_prompt}
+=== PLANNING AGENT ===
+{planning_agent.system_prompt}
+"""
+    
+    async def process(
+        self, 
+        task: str, 
+        context: str = "", 
+        include_metadata: bool = False
+    ) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]:
+        """
+        Produce research, planning and execution results with one LLM call.
+        
+        Args:
+            task: The main task or problem statement from the user
+            context: Additional context or background information
+            include_metadata: Attach each agent's metadata block to its section
+            
+        Returns:
+            Tuple of (research_results, planning_results, execution_results)
+        """
+        try:
+            logger.info(f"Combined Agent processing task: {task}")
+            
+            combined = await self.openai_service.generate_structured_response(
+                prompt=self._build_prompt(task, context),
+                system_prompt=self.system_prompt,
+                temperature=0.4,
+                max_tokens=8192,
+                json_mode=True,
+                cache_text=f"{task}\n{context}"
+            )
+            
+            research_results = combined.get("research", {})
+            planning_results = combined.get("planning", {})
+            execution_results = combined.get("execution", {})
+            if not (research_results and planning_results and execution_results):
+                raise Exception("Combined response is missing a section")
+            
+            logger.info("Combined Agent completed successfully")
+            if not include_metadata:
+                return research_results, planning_results, execution_results
+            
+            research_summary = self.research_agent.summarize(research_results)
+            planning_summary = summarize_planning(planning_results)
+            return (
+                self.research_agent._add_metadata(research_results, task, context),
+                self.planning_agent._add_metadata(planning_results, task, research_summary),
+                self.execution_agent._add_metadata(execution_results, task, research_summary, planning_summary)
+            )
+            
+        except Exception as e:
+            logger.error(f"Combined Agent failed: {e}")
+            raise Exception(f"Combined Agent processing failed: {str(e)}")
+    
+    async def process_research_plan(
+        self, 
+        task: str, 
+        context: str = "", 
+        include_metadata: bool = False
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Produce research and planning results with one LLM call.
+        
+        For tasks too large for process(): the execution phase still runs as
+        its own request, but the task is sent once for the first two phases.
+        
+        Args:
+            task: The main task or problem statement from the user
+            context: Additional context or background information
+            include_metadata: Attach each agent's metadata block to its section
+            
+        Returns:
+            Tuple of (research_results, planning_results)
+        """
+        try:
+            logger.info(f"Combined Agent researching and planning task: {task}")
+            
+            combined = await self.openai_service.generate_structured_response(
+                prompt=self._build_prompt(task, context, _RESEARCH_PLAN_INSTRUCTION),
+                system_prompt=self.research_plan_system_prompt,
+                temperature=0.3,
+                max_tokens=6144,
+                json_mode=True,
+                cache_text=f"{task}\n{context}"
+            )
+            
+            research_results = combined.get("research", {})
+            planning_results = combined.get("planning", {})
+            if not (research_results and planning_results):
+                raise Exception("Combined response is missing a section")
+            
+            logger.info("Combined Agent completed successfully")
+            if not include_metadata:
+                return research_results, planning_results
+            
+            research_summary = self.research_agent.summarize(research_results)
+            return (
+                self.research_agent._add_metadata(research_results, task, context),
+                self.planning_agent._add_metadata(planning_results, task, research_summary)
+            )
+            
+        except Exception as e:
+            logger.error(f"Combined Agent failed: {e}")
+            raise Exception(f"Combined Agent processing failed: {str(e)}")
+    
+    def _build_prompt(self, task: str, context: str, instruction: str = _FULL_INSTRUCTION) -> str:
+        """Build the user prompt for a combined request."""
+        return _PROMPT_TEMPLATE.format_map({
+            "task": task,
+            "context": f"CONTEXT: {context}" if context else "",
+            "instruction": instruction
+        })
+
+@functools.cache
+def get_combined_agent() -> CombinedAgent:
+    """
+    Get the CombinedAgent shared app-wide, built from the shared agents.
+    
+    Returns:
+        CombinedAgent instance
+    """
+    return CombinedAgent(get_research_agent(), get_planning_agent(), get_execution_agent())
@@ -0,0 +1,120 @@
+"""
+Dispatcher Module
+Hands LLM requests from the agents to a fixed pool of worker coroutines.
+"""
+
+import asyncio
+import contextvars
+import logging
+import os
+from typing import Any, Awaitable, Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+class Dispatcher:
+    """
+    Producer/consumer queue between prompt assembly and the LLM API.
+    
+    Agents build their prompts and submit the request; a pool of worker
+    coroutines drains the queue and awaits the API call. Callers from many
+    concurrent workflows can keep assembling prompts while earlier requests
+    are on the network, and at most `workers` requests are dispatched at once.
+    """
+    
+    def __init__(self, workers: int = 8):
+        """
+        Initialize the dispatcher.
+        
+        Args:
+            workers: Number of requests dispatched concurrently
+        """
+        self.workers = workers
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    def _ensure_workers(self) -> None:
+        """Start the worker pool on the running loop (again, if the loop changed)."""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        
+        self._loop = loop
+        self._queue = asyncio.Queue()
+        # Workers start in an empty context so they don't inherit the first
+        # submitter's context variables (e.g. its request scope)
+        self._tasks = [
+            contextvars.Context().run(loop.create_task, self._worker(), name=f"llm-dispatcher-{i}")
+            for i in range(self.workers)
+        ]
+        logger.info(f"Dispatcher started {self.workers} workers")
+    
+    async def _worker(self) -> None:
+        """Run queued requests one at a time, resolving each submitter's future."""
+        while True:
+            future, context, fn, args, kwargs = await self._queue.get()
+            try:
+                # The submitter may have given up while the request was queued
+                if future.cancelled():
+                    continue
+                # Run the request in the submitter's context (request scope etc.)
+                task = context.run(self._loop.create_task, fn(*args, **kwargs))
+                # A submitter that gives up cancels its request rather than
+                # leaving it to hold this worker until it completes
+                future.add_done_callback(lambda f, task=task: task.cancel() if f.cancelled() else None)
+                try:
+                    # wait() instead of awaiting the task, so a CancelledError
+                    # here only ever means the worker itself is being cancelled
+                    await asyncio.wait((task,))
+                except asyncio.CancelledError:
+                    task.cancel()
+                    future.cancel()
+                    raise
+                
+                if task.cancelled():
+                    future.cancel()
+                elif task.exception() is not None:
+                    if not future.done():
+                        future.set_exception(task.exception())
+                elif not future.done():
+                    future.set_result(task.result())
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            finally:
+                self._queue.task_done()
+    
+    async def submit(self, fn: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        """
+        Queue a request and wait for its result.
+        
+        Args:
+            fn: Coroutine function performing the request
+            *args: Positional arguments for fn
+            **kwargs: Keyword arguments for fn
+            
+        Returns:
+            Whatever fn returns
+            
+        Raises:
+            Exception: Whatever fn raises
+        """
+        self._ensure_workers()
+        future = self._loop.create_future()
+        await self._queue.put((future, contextvars.copy_context(), fn, args, kwargs))
+        return await future
+
+# Global instance shared by all agents
+dispatcher = None
+
+def get_dispatcher() -> Dispatcher:
+    """
+    Get or create the global dispatcher.
+    
+    Returns:
+        Dispatcher instance
+    """
+    global dispatcher
+    if dispatcher is None:
+        dispatcher = Dispatcher(int(os.getenv("LLM_DISPATCH_WORKERS", "8")))
+    return dispatcher
@@ -0,0 +1,99 @@
+"""
+Agent Streaming Module
+Wraps a streamed LLM response so callers can render chunks as they arrive.
+"""
+
+from typing import Dict, Any, AsyncIterator, Callable, Optional, Tuple
+
+import orjson
+
+
+class AgentStream:
+    """
+    Async iterable over the raw text chunks of an agent response.
+
+    Iterating the stream yields text chunks as they are generated. Once the
+    stream is exhausted, the parsed agent output is available on `result`.
+    """
+
+    def __init__(
+        self,
+        chunks: AsyncIterator[str],
+        finalize: Callable[[str], Dict[str, Any]]
+    ):
+        """
+        Initialize the stream.
+
+        Args:
+            chunks: Async iterator of response text chunks
+            finalize: Builds the agent output from the full response text
+        """
+        self._chunks = chunks
+        self._finalize = finalize
+        self.result: Optional[Dict[str, Any]] = None
+
+    async def __aiter__(self) -> AsyncIterator[str]:
+        parts = []
+        async for chunk in self._chunks:
+            parts.append(chunk)
+            yield chunk
+        self.result = self._finalize("".join(parts))
+
+
+async def iter_json_members(chunks: AsyncIterator[str]) -> AsyncIterator[Tuple[str, Any]]:
+    """
+    Yield the top-level members of a streamed JSON object as each one closes.
+
+    Text before the opening brace (such as a ```json fence) is skipped, and
+    nothing after the closing brace is read.
+
+    Args:
+        chunks: Async iterator of response text chunks
+
+    Yields:
+        (key, value) pairs in the order they appear in the object
+
+    Raises:
+        ValueError: If the chunks end before the object is closed (e.g. the
+            response was cut off at max_tokens)
+    """
+    buffer = ""
+    pos = 0
+    depth = 0
+    member_start = None
+    in_string = False
+    escaped = False
+
+    async for chunk in chunks:
+        buffer += chunk
+        while pos < len(buffer):
+            char = buffer[pos]
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif char == "\\":
+                    escaped = True
+                elif char == '"':
+                    in_string = False
+            elif member_start is None:
+                # Still looking for the opening brace of the object
+                if char == "{":
+                    depth = 1
+                    member_start = pos + 1
+            elif char == '"':
+                in_string = True
+            elif char in "{[":
+                depth += 1
+            elif char in "}]" or (char == "," and depth == 1):
+                if char != ",":
+                    depth -= 1
+                if depth <= 1 and (char == "," or depth == 0):
+                    member = buffer[member_start:pos].strip()
+                    if member:
+                        yield next(iter(orjson.loads(f"{{{member}}}").items()))
+                    if depth == 0:
+                        return
+                    member_start = pos + 1
+            pos += 1
+
+    raise ValueError("Streamed response ended before the JSON object was closed")
@@ -0,0 +1,111 @@
+"""
+Celery Application Module
+Runs workflows on background workers so API requests return immediately.
+
+Start a worker with:
+    celery -A backend.celery_app worker --loglevel=info
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Dict, Any, List, Optional
+
+from celery import Celery
+
+from .agents.research_agent import get_research_agent
+from .agents.planning_agent import get_planning_agent
+from .agents.execution_agent import get_execution_agent
+from .agents.combined_agent import get_combined_agent
+from .orchestrator import run_workflow
+from .services.openai_api import get_openai_service
+
+logger = logging.getLogger(__name__)
+
+celery_app = Celery(
+    "orchestrator",
+    broker=os.getenv("CELERY_BROKER_URL", "redis://localhost:6379/0"),
+    backend=os.getenv("CELERY_RESULT_BACKEND", "redis://localhost:6379/0")
+)
+celery_app.conf.update(
+    task_serializer="json",
+    result_serializer="json",
+    accept_content=["json"],
+    task_track_started=True
+)
+
+# Event loop reused by every task in this worker process, so the shared OpenAI
+# client's pooled connections (bound to the loop they were opened on) stay valid
+_loop: Optional[asyncio.AbstractEventLoop] = None
+
+def _run(coro):
+    """Run a coroutine to completion on this process's event loop."""
+    global _loop
+    if _loop is None:
+        _loop = asyncio.new_event_loop()
+    return _loop.run_until_complete(coro)
+
+@celery_app.task(name="workflow.run")
+def run_workflow_task(task: str, context: str = "", fused: bool = True) -> Dict[str, Any]:
+    """
+    Run a workflow on a worker.
+    
+    Args:
+        task: The main task or problem statement from the user
+        context: Additional context or background information
+        fused: Allow the combined single-call paths; False runs each agent separately
+        
+    Returns:
+        Dictionary with the same fields as the /workflow response
+    """
+    start_time = time.monotonic()
+    logger.info(f"Worker starting workflow for task: {task}")
+    
+    research_results, planning_results, execution_results = _run(run_workflow(
+        task,
+        context,
+        get_research_agent(),
+        get_planning_agent(),
+        get_execution_agent(),
+        get_combined_agent(),
+        fused
+    ))
+    
+    total_duration = time.monotonic() - start_time
+    logger.info(f"Workflow completed in {total_duration:.2f} seconds")
+    return {
+        "status": "completed",
+        "research_results": research_results,
+        "planning_results": planning_results,
+        "execution_results": execution_results,
+        "total_duration": total_duration
+    }
+
+@celery_app.task(name="batch.generate")
+def generate_batch_task(
+    prompts: List[str], 
+    system_prompt: str = "", 
+    temperature: float = 0.7, 
+    max_tokens: int = 2048
+) -> List[Dict[str, Any]]:
+    """
+    Generate responses to offline prompts through the OpenAI Batch API.
+    
+    Args:
+        prompts: User prompts, all sent with the same system prompt and settings
+        system_prompt: Optional system prompt for context
+        temperature: Controls randomness (0.0 to 2.0)
+        max_tokens: Maximum tokens in each response
+        
+    Returns:
+        One {"response": text} or {"error": message} entry per prompt, in prompt order
+    """
+    logger.info(f"Worker submitting {len(prompts)} prompts as a batch")
+    results = _run(get_openai_service().generate_batch(
+        prompts, system_prompt, temperature, max_tokens, priority="batch"
+    ))
+    return [
+        {"error": str(result)} if isinstance(result, Exception) else {"response": result}
+        for result in results
+    ]
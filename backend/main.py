@@ -3,12 +3,12 @@ AI Agentic Workflow Orchestrator - FastAPI Backend
 Main application entry point with API routes for workflow orchestration.
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import Depends, FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse, HTMLResponse
+from fastapi.responses import FileResponse, ORJSONResponse, Response, StreamingResponse
 from pydantic import BaseModel
-from typing import Dict, Any, List
+from typing import Dict, Any, AsyncIterator, List, Optional, Tuple
 import asyncio
 import logging
 import os
@@ -16,9 +16,18 @@ import subprocess
 import sys
 from pathlib import Path
 
-from .agents.research_agent import ResearchAgent
-from .agents.planning_agent import PlanningAgent
-from .agents.execution_agent import ExecutionAgent
+import httpx
+import msgspec
+import orjson
+from celery.result import AsyncResult
+
+from .agents.research_agent import ResearchAgent, get_research_agent
+from .agents.planning_agent import PlanningAgent, get_planning_agent
+from .agents.execution_agent import ExecutionAgent, get_execution_agent
+from .agents.combined_agent import CombinedAgent, get_combined_agent
+from .celery_app import celery_app, run_workflow_task
+from .orchestrator import iter_workflow, run_workflow
+from .services.openai_api import close_openai_service, get_openai_service
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -28,7 +37,8 @@ logger = logging.getLogger(__name__)
 app = FastAPI(
     title="AI Agentic Workflow Orchestrator",
     description="Multi-agent AI workflow orchestration powered by Gemini API",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware for frontend integration
@@ -45,40 +55,51 @@ class WorkflowRequest(BaseModel):
     task: str
     context: str = ""
 
-class WorkflowResponse(BaseModel):
+# Encoded with msgspec and returned as a raw Response, skipping Pydantic
+# validation of the large nested result dictionaries
+class WorkflowResponse(msgspec.Struct):
     status: str
     research_results: Dict[str, Any]
     planning_results: Dict[str, Any]
     execution_results: Dict[str, Any]
     total_duration: float
 
+class WorkflowJob(BaseModel):
+    id: str
+
+class WorkflowJobStatus(BaseModel):
+    id: str
+    state: str
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
 class HealthResponse(BaseModel):
     status: str
     message: str
     timestamp: str
 
-# Initialize agents
-research_agent = ResearchAgent()
-planning_agent = PlanningAgent()
-execution_agent = ExecutionAgent()
+# Static assets (landing page)
+STATIC_DIR = Path(__file__).parent / "static"
+app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
 
-# Streamlit integration
+# Streamlit integration (off unless ENABLE_STREAMLIT=1; run the UI separately otherwise)
 STREAMLIT_PORT = 8501
+ENABLE_STREAMLIT = os.getenv("ENABLE_STREAMLIT") == "1"
+_FRONTEND_APP = (Path(__file__).resolve().parent.parent / "app.py").as_posix()
 streamlit_process = None
 
 def start_streamlit():
     """Start Streamlit process in background."""
     global streamlit_process
     try:
-        frontend_path = Path(__file__).parent.parent / "frontend"
         streamlit_process = subprocess.Popen([
             sys.executable, "-m", "streamlit", "run", 
-            str(frontend_path / "app.py"),
+            _FRONTEND_APP,
             "--server.port", str(STREAMLIT_PORT),
             "--server.headless", "true",
             "--server.enableCORS", "false",
             "--server.enableXsrfProtection", "false"
-        ], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, close_fds=True)
         logger.info(f"Streamlit started on port {STREAMLIT_PORT}")
         return True
     except Exception as e:
@@ -95,154 +116,42 @@ def stop_streamlit():
 
 @app.on_event("startup")
 async def startup_event():
-    """Start Streamlit on app startup."""
-    start_streamlit()
+    """Start the shared internal HTTP client (and Streamlit, if enabled) on app startup."""
+    app.state.http = httpx.AsyncClient(timeout=2.0)
+    if ENABLE_STREAMLIT:
+        start_streamlit()
+    await warm_up()
+
+async def warm_up():
+    """
+    Pay the one-time setup costs before the first workflow request arrives.
+    
+    Builds the shared agents (and the OpenAI client behind them) and sends one
+    cheap API request, so the pooled connection's TLS/HTTP2 handshake is done.
+    A failure is logged rather than raised so the API can still start.
+    """
+    try:
+        get_combined_agent()
+        if await get_openai_service().validate_api_connection():
+            logger.info("LLM connection warmed up")
+        else:
+            logger.warning("LLM warm-up request failed; the first workflow will connect on demand")
+    except Exception as e:
+        logger.warning(f"LLM warm-up skipped: {e}")
 
 @app.on_event("shutdown")
 async def shutdown_event():
-    """Stop Streamlit on app shutdown."""
+    """Stop Streamlit and close pooled HTTP connections on app shutdown."""
     stop_streamlit()
+    await app.state.http.aclose()
+    await close_openai_service()
 
-@app.get("/", response_class=HTMLResponse)
+@app.get("/", response_class=FileResponse)
 async def root():
     """
-    Root endpoint that redirects to the Streamlit frontend.
-    """
-    return """
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>AI Agentic Workflow Orchestrator</title>
-        <meta charset="utf-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1">
-        <style>
-            body {
-                font-family: Arial, sans-serif;
-                margin: 0;
-                padding: 20px;
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                color: white;
-                text-align: center;
-            }
-            .container {
-                max-width: 800px;
-                margin: 0 auto;
-                padding: 40px 20px;
-            }
-            h1 {
-                font-size: 2.5rem;
-                margin-bottom: 20px;
-                text-shadow: 2px 2px 4px rgba(0,0,0,0.3);
-            }
-            .subtitle {
-                font-size: 1.2rem;
-                margin-bottom: 40px;
-                opacity: 0.9;
-            }
-            .buttons {
-                display: flex;
-                gap: 20px;
-                justify-content: center;
-                flex-wrap: wrap;
-            }
-            .btn {
-                display: inline-block;
-                padding: 15px 30px;
-                background: rgba(255,255,255,0.2);
-                color: white;
-                text-decoration: none;
-                border-radius: 10px;
-                border: 2px solid rgba(255,255,255,0.3);
-                transition: all 0.3s ease;
-                font-size: 1.1rem;
-                font-weight: bold;
-            }
-            .btn:hover {
-                background: rgba(255,255,255,0.3);
-                transform: translateY(-2px);
-                box-shadow: 0 5px 15px rgba(0,0,0,0.2);
-            }
-            .btn-primary {
-                background: rgba(255,255,255,0.3);
-                border-color: rgba(255,255,255,0.5);
-            }
-            .status {
-                margin-top: 40px;
-                padding: 20px;
-                background: rgba(255,255,255,0.1);
-                border-radius: 10px;
-                border: 1px solid rgba(255,255,255,0.2);
-            }
-            .status-item {
-                margin: 10px 0;
-                display: flex;
-                justify-content: space-between;
-                align-items: center;
-            }
-            .status-label {
-                font-weight: bold;
-            }
-            .status-value {
-                padding: 5px 15px;
-                border-radius: 20px;
-                font-size: 0.9rem;
-            }
-            .status-ok {
-                background: rgba(76, 175, 80, 0.3);
-                border: 1px solid rgba(76, 175, 80, 0.5);
-            }
-            .status-error {
-                background: rgba(244, 67, 54, 0.3);
-                border: 1px solid rgba(244, 67, 54, 0.5);
-            }
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <h1>🤖 AI Agentic Workflow Orchestrator</h1>
-            <p class="subtitle">Multi-agent AI workflow orchestration powered by Gemini API</p>
-            
-            <div class="buttons">
-                <a href="/app" class="btn btn-primary">🚀 Launch Application</a>
-                <a href="http://localhost:8501" class="btn">📱 Direct Frontend</a>
-                <a href="/docs" class="btn">📚 API Documentation</a>
-                <a href="/health" class="btn">🔧 Health Check</a>
-            </div>
-            
-            <div class="status">
-                <h3>System Status</h3>
-                <div class="status-item">
-                    <span class="status-label">Backend API:</span>
-                    <span class="status-value status-ok">Running</span>
-                </div>
-                <div class="status-item">
-                    <span class="status-label">Frontend:</span>
-                    <span class="status-value status-ok">Available</span>
-                </div>
-                <div class="status-item">
-                    <span class="status-label">Gemini API:</span>
-                    <span class="status-value status-ok">Connected</span>
-                </div>
-            </div>
-        </div>
-        
-        <script>
-            // Check if Streamlit is available
-            fetch('/app')
-                .then(response => {
-                    if (!response.ok) {
-                        document.querySelector('.status-item:nth-child(2) .status-value').className = 'status-value status-error';
-                        document.querySelector('.status-item:nth-child(2) .status-value').textContent = 'Not Available';
-                    }
-                })
-                .catch(() => {
-                    document.querySelector('.status-item:nth-child(2) .status-value').className = 'status-value status-error';
-                    document.querySelector('.status-item:nth-child(2) .status-value').textContent = 'Not Available';
-                });
-        </script>
-    </body>
-    </html>
+    Root endpoint that links to the Streamlit frontend.
     """
+    return FileResponse(STATIC_DIR / "index.html")
 
 @app.get("/app")
 async def streamlit_app():
@@ -262,11 +171,10 @@ async def health_check():
     # Check Streamlit status
     streamlit_status = "healthy"
     try:
-        import requests
-        response = requests.get(f"http://localhost:{STREAMLIT_PORT}", timeout=2)
+        response = await app.state.http.get(f"http://localhost:{STREAMLIT_PORT}")
         if response.status_code != 200:
             streamlit_status = "error"
-    except:
+    except httpx.HTTPError:
         streamlit_status = "unavailable"
     
     return HealthResponse(
@@ -275,53 +183,191 @@ async def health_check():
         timestamp=datetime.datetime.now().isoformat()
     )
 
-@app.post("/workflow", response_model=WorkflowResponse)
-async def orchestrate_workflow(request: WorkflowRequest):
+# Workflows currently running, keyed by (task, context, fused)
+_inflight_workflows: Dict[Tuple[str, str, bool], asyncio.Task] = {}
+
+@app.post("/workflow", response_class=Response)
+async def orchestrate_workflow(
+    request: WorkflowRequest, 
+    fused: bool = True, 
+    research_agent: ResearchAgent = Depends(get_research_agent), 
+    planning_agent: PlanningAgent = Depends(get_planning_agent), 
+    execution_agent: ExecutionAgent = Depends(get_execution_agent), 
+    combined_agent: CombinedAgent = Depends(get_combined_agent)
+):
     """
     Main workflow orchestration endpoint that coordinates all three agents.
     
-    Flow: Research → Planning → Execution
+    Flow: Research → Planning → Execution (one combined call for simple tasks)
+    
+    Research and planning come from one combined call unless `?fused=false`
+    is passed, which runs each agent separately, simple tasks included (for
+    A/B comparison).
+    
+    Concurrent requests for the same task and context share one run.
     """
     import time
-    start_time = time.time()
+    start_time = time.monotonic()
     
     try:
-        logger.info(f"Starting workflow for task: {request.task}")
-        
-        # Phase 1: Research Agent
-        logger.info("Phase 1: Research Agent")
-        research_results = await research_agent.process(request.task, request.context)
-        
-        # Phase 2: Planning Agent
-        logger.info("Phase 2: Planning Agent")
-        planning_results = await planning_agent.process(
-            request.task, 
-            research_results
-        )
+        key = (request.task, request.context, fused)
+        workflow = _inflight_workflows.get(key)
+        if workflow is None:
+            logger.info(f"Starting workflow for task: {request.task}")
+            workflow = asyncio.create_task(run_workflow(
+                request.task,
+                request.context,
+                research_agent,
+                planning_agent,
+                execution_agent,
+                combined_agent,
+                fused
+            ))
+            _inflight_workflows[key] = workflow
+            workflow.add_done_callback(lambda _: _inflight_workflows.pop(key, None))
+        else:
+            logger.info(f"Joining in-flight workflow for task: {request.task}")
         
-        # Phase 3: Execution Agent
-        logger.info("Phase 3: Execution Agent")
-        execution_results = await execution_agent.process(
-            request.task,
-            research_results,
-            planning_results
-        )
+        # Shielded so one client disconnecting doesn't cancel the run for the others
+        research_results, planning_results, execution_results = await asyncio.shield(workflow)
         
-        total_duration = time.time() - start_time
+        total_duration = time.monotonic() - start_time
         logger.info(f"Workflow completed in {total_duration:.2f} seconds")
         
-        return WorkflowResponse(
-            status="completed",
-            research_results=research_results,
-            planning_results=planning_results,
-            execution_results=execution_results,
-            total_duration=total_duration
+        return Response(
+            content=msgspec.json.encode(WorkflowResponse(
+                status="completed",
+                research_results=research_results,
+                planning_results=planning_results,
+                execution_results=execution_results,
+                total_duration=total_duration
+            )),
+            media_type="application/json"
         )
         
     except Exception as e:
         logger.error(f"Workflow failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Workflow execution failed: {str(e)}")
 
+def _event(**fields) -> bytes:
+    """Encode one workflow stream event as an NDJSON line."""
+    return orjson.dumps(fields) + b"\n"
+
+async def stream_workflow_events(
+    task: str, 
+    context: str, 
+    research_agent: ResearchAgent, 
+    planning_agent: PlanningAgent, 
+    execution_agent: ExecutionAgent, 
+    combined_agent: CombinedAgent, 
+    fused: bool = True
+) -> AsyncIterator[bytes]:
+    """
+    Run the agents for one task, yielding progress as NDJSON events.
+    
+    Events (one JSON object per line, told apart by "event"):
+        phase: a phase started
+        chunk: raw response text from the running phase
+        result: a phase's parsed output
+        section: one top-level execution section, as soon as it is complete
+        completed: the workflow finished, with its total duration
+        error: the workflow failed (the response status is already sent)
+    """
+    import time
+    start_time = time.monotonic()
+    
+    try:
+        async for event, phase, data in iter_workflow(
+            task,
+            context,
+            research_agent,
+            planning_agent,
+            execution_agent,
+            combined_agent,
+            fused,
+            stream=True
+        ):
+            if event == "phase":
+                yield _event(event="phase", phase=phase)
+            elif event == "chunk":
+                yield _event(event="chunk", phase=phase, text=data)
+            else:
+                yield _event(event=event, phase=phase, data=data)
+        
+        total_duration = time.monotonic() - start_time
+        logger.info(f"Workflow completed in {total_duration:.2f} seconds")
+        yield _event(event="completed", total_duration=total_duration)
+        
+    except Exception as e:
+        logger.error(f"Workflow failed: {str(e)}")
+        yield _event(event="error", detail=f"Workflow execution failed: {str(e)}")
+
+@app.post("/workflow/stream")
+async def stream_workflow(
+    request: WorkflowRequest, 
+    fused: bool = True, 
+    research_agent: ResearchAgent = Depends(get_research_agent), 
+    planning_agent: PlanningAgent = Depends(get_planning_agent), 
+    execution_agent: ExecutionAgent = Depends(get_execution_agent), 
+    combined_agent: CombinedAgent = Depends(get_combined_agent)
+):
+    """
+    Streaming variant of /workflow.
+    
+    Responds with NDJSON events as the agents work, so clients can show each
+    phase's output while later phases are still running. Takes the same
+    `fused` query parameter as /workflow.
+    """
+    logger.info(f"Starting streamed workflow for task: {request.task}")
+    return StreamingResponse(
+        stream_workflow_events(
+            request.task,
+            request.context,
+            research_agent,
+            planning_agent,
+            execution_agent,
+            combined_agent,
+            fused
+        ),
+        media_type="application/x-ndjson"
+    )
+
+@app.post("/workflow/async", response_model=WorkflowJob, status_code=202)
+def submit_workflow(request: WorkflowRequest, fused: bool = True):
+    """
+    Queue a workflow on the Celery workers and return its id immediately.
+    
+    Poll GET /workflow/{job_id} for the state and, once finished, the result.
+    """
+    try:
+        job = run_workflow_task.delay(request.task, request.context, fused)
+    except Exception as e:
+        logger.error(f"Failed to queue workflow: {str(e)}")
+        raise HTTPException(status_code=503, detail=f"Failed to queue workflow: {str(e)}")
+    
+    logger.info(f"Queued workflow {job.id} for task: {request.task}")
+    return WorkflowJob(id=job.id)
+
+@app.get("/workflow/{job_id}", response_model=WorkflowJobStatus)
+def get_workflow_job(job_id: str):
+    """
+    Report the state of a queued workflow, with its result once it has finished.
+    """
+    job = AsyncResult(job_id, app=celery_app)
+    if job.failed():
+        return WorkflowJobStatus(id=job_id, state=job.state, error=str(job.result))
+    if job.successful():
+        return WorkflowJobStatus(id=job_id, state=job.state, result=job.result)
+    return WorkflowJobStatus(id=job_id, state=job.state)
+
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    uvicorn.run(
+        "backend.main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop" if sys.platform != "win32" else "asyncio",
+        http="httptools",
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+        proxy_headers=True
+    )
@@ -0,0 +1,165 @@
+"""
+Workflow Orchestrator Module
+Runs the agents for one task, shared by the API routes and background workers.
+"""
+
+import logging
+from typing import Dict, Any, AsyncIterator, Tuple
+
+from .agents.research_agent import ResearchAgent
+from .agents.planning_agent import PlanningAgent
+from .agents.execution_agent import ExecutionAgent
+from .agents.combined_agent import CombinedAgent, is_simple_task
+from .services.openai_api import request_scope
+
+logger = logging.getLogger(__name__)
+
+async def iter_workflow(
+    task: str, 
+    context: str, 
+    research_agent: ResearchAgent, 
+    planning_agent: PlanningAgent, 
+    execution_agent: ExecutionAgent, 
+    combined_agent: CombinedAgent, 
+    fused: bool = True, 
+    stream: bool = False
+) -> AsyncIterator[Tuple[str, str, Any]]:
+    """
+    Run the agents for one task, yielding progress events as it goes.
+    
+    run_workflow and the streaming API route both consume this, so they take
+    the same path (single-call shortcuts, fallbacks) and only differ in what
+    they report.
+    
+    Args:
+        task: The main task or problem statement from the user
+        context: Additional context or background information
+        research_agent: Agent for the research phase
+        planning_agent: Agent for the planning phase
+        execution_agent: Agent for the execution phase
+        combined_agent: Agent for the single-call paths
+        fused: Allow the Combined Agent's single-call paths; False always runs
+            one call per agent
+        stream: Stream the per-agent responses (chunk and section events)
+            instead of waiting for each whole response
+    
+    Yields:
+        (event, phase, data) tuples:
+            ("phase", phase, None): a phase started ("combined", "research_planning",
+                "research", "planning" or "execution")
+            ("chunk", phase, text): raw response text (stream only)
+            ("result", phase, results): a phase's parsed output
+            ("section", "execution", section): one top-level execution section as
+                soon as it is complete (stream only, instead of the execution result)
+    """
+    # Identical prompts within this run are only sent once
+    with request_scope():
+        if fused and is_simple_task(task, context):
+            # Simple tasks get all three results from a single LLM call
+            logger.info("Combined Agent (simple task)")
+            yield "phase", "combined", None
+            try:
+                combined_results = await combined_agent.process(task, context)
+            except Exception as e:
+                logger.warning(f"Combined Agent failed, falling back to separate agents: {e}")
+                fused = False
+            else:
+                for phase, results in zip(("research", "planning", "execution"), combined_results):
+                    yield "result", phase, results
+                return
+        
+        research_results = planning_results = None
+        if fused:
+            # Phases 1-2: research and plan from a single LLM call
+            logger.info("Phases 1-2: Combined Agent (research + planning)")
+            yield "phase", "research_planning", None
+            try:
+                research_results, planning_results = await combined_agent.process_research_plan(task, context)
+            except Exception as e:
+                logger.warning(f"Combined Agent failed, falling back to separate agents: {e}")
+            else:
+                yield "result", "research", research_results
+                yield "result", "planning", planning_results
+        
+        if research_results is None:
+            # Phase 1: Research Agent
+            logger.info("Phase 1: Research Agent")
+            yield "phase", "research", None
+            if stream:
+                agent_stream = research_agent.stream_process(task, context)
+                async for chunk in agent_stream:
+                    yield "chunk", "research", chunk
+                research_results = agent_stream.result
+            else:
+                research_results = await research_agent.process(task, context)
+            yield "result", "research", research_results
+        
+        # Summarize the research once for both later phases
+        research_summary = research_agent.summarize(research_results)
+        
+        if planning_results is None:
+            # Phase 2: Planning Agent
+            logger.info("Phase 2: Planning Agent")
+            yield "phase", "planning", None
+            if stream:
+                agent_stream = planning_agent.stream_process(
+                    task, research_results, research_summary=research_summary
+                )
+                async for chunk in agent_stream:
+                    yield "chunk", "planning", chunk
+                planning_results = agent_stream.result
+            else:
+                planning_results = await planning_agent.process(
+                    task, research_results, research_summary=research_summary
+                )
+            yield "result", "planning", planning_results
+        
+        # Phase 3: Execution Agent
+        logger.info("Phase 3: Execution Agent")
+        yield "phase", "execution", None
+        if stream:
+            async for section in execution_agent.stream_sections(
+                task, research_results, planning_results, research_summary=research_summary
+            ):
+                yield "section", "execution", section
+        else:
+            execution_results = await execution_agent.process(
+                task,
+                research_results,
+                planning_results,
+                research_summary=research_summary
+            )
+            yield "result", "execution", execution_results
+
+async def run_workflow(
+    task: str, 
+    context: str, 
+    research_agent: ResearchAgent, 
+    planning_agent: PlanningAgent, 
+    execution_agent: ExecutionAgent, 
+    combined_agent: CombinedAgent, 
+    fused: bool = True
+) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]:
+    """
+    Run the agents for one task.
+    
+    Args:
+        task: The main task or problem statement from the user
+        context: Additional context or background information
+        research_agent: Agent for the research phase
+        planning_agent: Agent for the planning phase
+        execution_agent: Agent for the execution phase
+        combined_agent: Agent for the single-call paths
+        fused: Allow the Combined Agent's single-call paths; False always runs
+            one call per agent
+    
+    Returns:
+        Tuple of (research_results, planning_results, execution_results)
+    """
+    results: Dict[str, Dict[str, Any]] = {}
+    async for event, phase, data in iter_workflow(
+        task, context, research_agent, planning_agent, execution_agent, combined_agent, fused
+    ):
+        if event == "result":
+            results[phase] = data
+    return results["research"], results["planning"], results["execution"]
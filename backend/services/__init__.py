@@ -3,6 +3,7 @@ Services Package
 Contains external service integrations and utilities.
 """
 
-from .openai_api import OpenAIAPIService, get_openai_service
+from .openai_api import OpenAIAPIService, close_openai_service, get_openai_service, request_scope
+from .semantic_cache import SemanticCache
 
-__all__ = ['OpenAIAPIService', 'get_openai_service']
+__all__ = ['OpenAIAPIService', 'close_openai_service', 'get_openai_service', 'request_scope', 'SemanticCache']
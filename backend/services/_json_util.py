@@ -0,0 +1,59 @@
+"""
+JSON Utilities Module
+Extract and parse the JSON payload of an LLM response.
+"""
+
+import re
+from typing import Any
+
+import orjson
+
+# Format instruction appended to structured prompts, prebuilt for the common case
+_JSON_SUFFIX = "\n\nPlease respond in JSON format."
+
+# A response wrapped in a single ```json ... ``` (or ``` ... ```) fence. Both ends
+# are anchored so fences inside JSON strings are left alone.
+_FENCE_RE = re.compile(r"\A\s*```(?:json)?\s*(.*?)\s*```\s*\Z", re.S)
+
+
+def parse_json_response(response_text: str) -> Any:
+    """
+    Parse the JSON payload of a model response in one pass.
+
+    A surrounding code fence is stripped; failing that, any prose around the
+    payload is dropped by parsing from the first "{" through the last "}".
+
+    Args:
+        response_text: Raw response text from the model
+
+    Returns:
+        Parsed JSON value
+
+    Raises:
+        orjson.JSONDecodeError: If the payload is not valid JSON
+    """
+    match = _FENCE_RE.match(response_text)
+    payload = match.group(1) if match else response_text.strip()
+    try:
+        return orjson.loads(payload)
+    except orjson.JSONDecodeError:
+        start, end = payload.find("{"), payload.rfind("}")
+        if start == -1 or end < start:
+            raise
+        return orjson.loads(payload[start:end + 1])
+
+
+def add_format_instruction(prompt: str, expected_format: str = "JSON") -> str:
+    """
+    Append the response format instruction to a structured prompt.
+
+    Args:
+        prompt: The user prompt
+        expected_format: Expected response format
+
+    Returns:
+        Prompt ending with the format instruction
+    """
+    if expected_format == "JSON":
+        return prompt + _JSON_SUFFIX
+    return f"{prompt}\n\nPlease respond in {expected_format} format."
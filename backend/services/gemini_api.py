@@ -5,45 +5,98 @@ Handles all interactions with Google's Gemini API for the AI agents.
 
 import os
 import asyncio
+import functools
+import hashlib
 import logging
-from typing import Dict, Any, List, Optional
+import time
+from typing import Dict, Any, AsyncIterator, List, Optional, Tuple, Union
 import google.generativeai as genai
+import orjson
 from dotenv import load_dotenv
 
+from ._json_util import add_format_instruction, parse_json_response
+from .llm_cache import InflightCancelled, LRUCache
+
 # Load environment variables
 load_dotenv()
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Seconds a validate_api_connection outcome is reused before checking again
+VALIDATION_TTL_SECONDS = 60.0
+
+@functools.lru_cache(maxsize=None)
+def _get_model(api_key: str) -> genai.GenerativeModel:
+    """
+    Configure the Gemini SDK and create the model shared by every service instance.
+    
+    genai.configure sets process-wide state, so it runs once per API key
+    rather than on every service construction.
+    
+    Args:
+        api_key: Gemini API key
+        
+    Returns:
+        Shared GenerativeModel
+    """
+    genai.configure(api_key=api_key)
+    
+    try:
+        # Try the newer model name first
+        try:
+            model = genai.GenerativeModel('gemini-1.5-pro')
+            logger.info("Gemini API service initialized with gemini-1.5-pro")
+        except:
+            # Fallback to the older model name
+            model = genai.GenerativeModel('gemini-pro')
+            logger.info("Gemini API service initialized with gemini-pro")
+    except Exception as e:
+        logger.error(f"Failed to initialize Gemini API: {e}")
+        raise
+    return model
+
 class GeminiAPIService:
     """
     Service class for handling Gemini API interactions.
     Provides async methods for generating responses with proper error handling.
     """
     
-    def __init__(self):
-        """Initialize the Gemini API service with configuration."""
+    def __init__(self, cache_enabled: bool = True):
+        """
+        Initialize the Gemini API service with configuration.
+        
+        Args:
+            cache_enabled: Reuse responses to identical requests
+                (disable when sampling at high temperatures)
+        """
         self.api_key = os.getenv("GEMINI_API_KEY")
         if not self.api_key:
             raise ValueError("GEMINI_API_KEY environment variable is required")
         
-        # Configure Gemini API
-        genai.configure(api_key=self.api_key)
+        # Configure Gemini API and initialize the model (once per process)
+        self.model = _get_model(self.api_key)
         
-        # Initialize the model
-        try:
-            # Try the newer model name first
-            try:
-                self.model = genai.GenerativeModel('gemini-1.5-pro')
-                logger.info("Gemini API service initialized with gemini-1.5-pro")
-            except:
-                # Fallback to the older model name
-                self.model = genai.GenerativeModel('gemini-pro')
-                logger.info("Gemini API service initialized with gemini-pro")
-        except Exception as e:
-            logger.error(f"Failed to initialize Gemini API: {e}")
-            raise
+        # Responses to identical requests, so retries and repeated prompts skip the API
+        self.cache_enabled = cache_enabled
+        self._response_cache = LRUCache(512)
+        
+        # Identical requests currently awaiting a response, keyed by request hash
+        self._inflight: Dict[str, asyncio.Future] = {}
+        
+        # (checked at, outcome) of the last validate_api_connection call
+        self._last_validation: Optional[Tuple[float, bool]] = None
+    
+    def _request_key(
+        self, 
+        prompt: str, 
+        system_prompt: str, 
+        temperature: float, 
+        max_tokens: int
+    ) -> str:
+        """Hash the inputs that determine a response."""
+        raw = f"{temperature}|{max_tokens}|{system_prompt}|{prompt}"
+        return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
     
     async def generate_response(
         self, 
@@ -67,24 +120,61 @@ class GeminiAPIService:
         Raises:
             Exception: If API call fails
         """
+        key = self._request_key(prompt, system_prompt, temperature, max_tokens)
+        if self.cache_enabled:
+            cached = await self._response_cache.get(key)
+            if cached is not None:
+                logger.info("Reusing cached response")
+                return cached
+        
+        # Single-flight: an identical request already on the wire is awaited
+        # instead of being sent again
+        loop = asyncio.get_running_loop()
+        inflight = self._inflight.get(key)
+        while inflight is not None and inflight.get_loop() is loop:
+            logger.info("Joining an identical in-flight request")
+            try:
+                return await asyncio.shield(inflight)
+            except InflightCancelled:
+                # The caller sending it was cancelled; join a retry or send one
+                inflight = self._inflight.get(key)
+        
+        future = loop.create_future()
+        self._inflight[key] = future
         try:
-            # Combine system prompt and user prompt
-            full_prompt = f"{system_prompt}\n\n{prompt}" if system_prompt else prompt
-            
-            # Configure generation parameters
-            generation_config = genai.types.GenerationConfig(
-                temperature=temperature,
-                max_output_tokens=max_tokens,
-            )
-            
-            # Run the API call in a thread pool to make it async
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                None,
-                lambda: self.model.generate_content(
-                    full_prompt,
-                    generation_config=generation_config
-                )
+            text = await self._complete(prompt, system_prompt, temperature, max_tokens)
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the exception retrieved in case no other caller joined
+            future.exception()
+            raise
+        except BaseException:
+            # Hand the request back to any joiners instead of cancelling them too
+            future.set_exception(InflightCancelled())
+            future.exception()
+            raise
+        else:
+            future.set_result(text)
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+        
+        if self.cache_enabled:
+            await self._response_cache.set(key, text)
+        return text
+    
+    async def _complete(
+        self, 
+        prompt: str, 
+        system_prompt: str, 
+        temperature: float, 
+        max_tokens: int
+    ) -> str:
+        """Send one generation request and return its text."""
+        try:
+            response = await self.model.generate_content_async(
+                self._full_prompt(prompt, system_prompt),
+                generation_config=self._generation_config(temperature, max_tokens)
             )
             
             if response.text:
@@ -97,6 +187,81 @@ class GeminiAPIService:
             logger.error(f"Gemini API call failed: {e}")
             raise Exception(f"Failed to generate response: {str(e)}")
     
+    async def stream_response(
+        self, 
+        prompt: str, 
+        system_prompt: str = "",
+        temperature: float = 0.7,
+        max_tokens: int = 2048
+    ) -> AsyncIterator[str]:
+        """
+        Stream a response from Gemini API as it is generated.
+        
+        Args:
+            prompt: The user prompt
+            system_prompt: Optional system prompt for context
+            temperature: Controls randomness (0.0 to 1.0)
+            max_tokens: Maximum tokens in response
+            
+        Yields:
+            Text chunks in the order they are produced
+            
+        Raises:
+            Exception: If API call fails
+        """
+        parts = []
+        try:
+            response = await self.model.generate_content_async(
+                self._full_prompt(prompt, system_prompt),
+                generation_config=self._generation_config(temperature, max_tokens),
+                stream=True
+            )
+            async for chunk in response:
+                if chunk.text:
+                    parts.append(chunk.text)
+                    yield chunk.text
+        except Exception as e:
+            logger.error(f"Gemini API stream failed: {e}")
+            raise Exception(f"Failed to stream response: {str(e)}")
+        
+        logger.info(f"Streamed response successfully ({len(''.join(parts))} characters)")
+    
+    def _full_prompt(self, prompt: str, system_prompt: str) -> str:
+        """Combine system prompt and user prompt."""
+        return f"{system_prompt}\n\n{prompt}" if system_prompt else prompt
+    
+    def _generation_config(self, temperature: float, max_tokens: int) -> "genai.types.GenerationConfig":
+        """Configure generation parameters."""
+        return genai.types.GenerationConfig(
+            temperature=temperature,
+            max_output_tokens=max_tokens,
+        )
+    
+    async def generate_batch(
+        self, 
+        prompts: List[str], 
+        system_prompt: str = "",
+        temperature: float = 0.7,
+        max_tokens: int = 2048
+    ) -> List[Union[str, Exception]]:
+        """
+        Generate responses to independent prompts concurrently.
+        
+        Args:
+            prompts: User prompts, all sent with the same system prompt and settings
+            system_prompt: Optional system prompt for context
+            temperature: Controls randomness (0.0 to 1.0)
+            max_tokens: Maximum tokens in each response
+            
+        Returns:
+            One response text per prompt, in prompt order; a failed prompt's
+            entry is its exception
+        """
+        return await asyncio.gather(
+            *(self.generate_response(prompt, system_prompt, temperature, max_tokens) for prompt in prompts),
+            return_exceptions=True
+        )
+    
     async def generate_structured_response(
         self, 
         prompt: str, 
@@ -118,7 +283,7 @@ class GeminiAPIService:
         """
         try:
             # Add format instructions to the prompt
-            format_prompt = f"{prompt}\n\nPlease respond in {expected_format} format."
+            format_prompt = add_format_instruction(prompt, expected_format)
             
             response_text = await self.generate_response(
                 format_prompt, 
@@ -128,17 +293,9 @@ class GeminiAPIService:
             
             # Try to parse as JSON if that's the expected format
             if expected_format.upper() == "JSON":
-                import json
                 try:
-                    # Clean the response to extract JSON
-                    response_text = response_text.strip()
-                    if response_text.startswith("```json"):
-                        response_text = response_text[7:]
-                    if response_text.endswith("```"):
-                        response_text = response_text[:-3]
-                    
-                    return json.loads(response_text)
-                except json.JSONDecodeError as e:
+                    return parse_json_response(response_text)
+                except orjson.JSONDecodeError as e:
                     logger.warning(f"Failed to parse JSON response: {e}")
                     # Return as text if JSON parsing fails
                     return {"response": response_text}
@@ -153,25 +310,25 @@ class GeminiAPIService:
         """
         Validate that the Gemini API is accessible and working.
         
+        Uses a token count rather than a generation, and reuses the outcome
+        for VALIDATION_TTL_SECONDS.
+        
         Returns:
             True if connection is successful, False otherwise
         """
+        now = time.monotonic()
+        if self._last_validation is not None and now - self._last_validation[0] < VALIDATION_TTL_SECONDS:
+            return self._last_validation[1]
+        
         try:
-            # First, try to list available models
-            try:
-                models = genai.list_models()
-                logger.info(f"Available models: {[model.name for model in models]}")
-            except Exception as e:
-                logger.warning(f"Could not list models: {e}")
-            
-            test_response = await self.generate_response(
-                "Hello, please respond with 'API is working' if you can see this message.",
-                temperature=0.1
-            )
-            return "API is working" in test_response or len(test_response) > 0
+            await self.model.count_tokens_async("ping")
+            valid = True
         except Exception as e:
             logger.error(f"API validation failed: {e}")
-            return False
+            valid = False
+        
+        self._last_validation = (now, valid)
+        return valid
 
 # Global instance for reuse across agents
 gemini_service = None
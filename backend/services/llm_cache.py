@@ -0,0 +1,66 @@
+"""
+LLM Cache Module
+Bounded least-recently-used cache for LLM responses.
+"""
+
+import asyncio
+import copy
+from collections import OrderedDict
+from typing import Any, Optional
+
+
+class InflightCancelled(Exception):
+    """
+    Set on a shared in-flight future when the caller sending the request is cancelled.
+
+    Callers that joined the request catch it and send the request themselves,
+    rather than inheriting a cancellation that was never theirs.
+    """
+
+
+class LRUCache:
+    """
+    Async-safe LRU cache holding at most `capacity` entries.
+
+    Values are deep-copied on the way in and out, so callers can freely
+    mutate what they get back (agents attach metadata to parsed responses).
+    """
+
+    def __init__(self, capacity: int = 10_000):
+        """
+        Initialize the cache.
+
+        Args:
+            capacity: Maximum number of entries before the oldest is evicted
+        """
+        self.capacity = capacity
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = asyncio.Lock()
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Return a copy of the cached value for `key`, or None on a miss."""
+        async with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            return copy.deepcopy(self._entries[key])
+
+    async def set(self, key: str, value: Any) -> None:
+        """Store a copy of `value`, evicting the least recently used entry if full."""
+        async with self._lock:
+            self._entries[key] = copy.deepcopy(value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+
+    async def delete(self, key: str) -> None:
+        """Drop the entry for `key`, if there is one."""
+        async with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -5,43 +5,167 @@ Handles all interactions with OpenAI's API for the AI agents.
 
 import os
 import asyncio
+import hashlib
 import logging
-from typing import Dict, Any, List, Optional
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import Dict, Any, List, Optional, AsyncIterator, Tuple, Union
+import httpx
 import openai
+import orjson
 from dotenv import load_dotenv
 
-# Load environment variables
+from ._json_util import add_format_instruction, parse_json_response
+from .llm_cache import InflightCancelled, LRUCache
+from .rate_limiter import AsyncRateLimiter
+from .semantic_cache import SemanticCache
+
+# Load environment variables (values already set in the environment take precedence)
 load_dotenv()
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Seconds a validate_api_connection outcome is reused before checking again
+VALIDATION_TTL_SECONDS = 60.0
+
+# Near-duplicate prompts are only matched for low-temperature (near-deterministic) requests
+SEMANTIC_CACHE_MAX_TEMPERATURE = 0.4
+
+def _cache_key(*parts: Any) -> str:
+    """Hash the parts identifying a cache entry into the key used by every cache."""
+    raw = "\0".join(str(part) for part in parts)
+    return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+# Responses generated within the current request scope, keyed by request hash
+_request_cache: ContextVar[Optional[Dict[str, str]]] = ContextVar("request_cache", default=None)
+
+@contextmanager
+def request_scope():
+    """
+    Deduplicate identical LLM requests made within the enclosed block.
+    
+    Wrap one workflow run in this so repeated prompts (e.g. the same research
+    question asked twice) are only sent once. Tasks created inside the block
+    share the scope; the responses are dropped when it exits.
+    """
+    token = _request_cache.set({})
+    try:
+        yield
+    finally:
+        _request_cache.reset(token)
+
 class OpenAIAPIService:
     """
     Service class for handling OpenAI API interactions.
     Provides async methods for generating responses with proper error handling.
     """
     
-    def __init__(self):
-        """Initialize the OpenAI API service with configuration."""
+    def __init__(self, cache_enabled: bool = True):
+        """
+        Initialize the OpenAI API service with configuration.
+        
+        Args:
+            cache_enabled: Reuse raw and structured responses to identical requests
+                across runs (disable when sampling at high temperatures)
+        """
         self.api_key = os.getenv("OPENAI_API_KEY")
         if not self.api_key:
             raise ValueError("OPENAI_API_KEY environment variable is required")
         
-        # Configure OpenAI API
-        self.client = openai.OpenAI(api_key=self.api_key)
+        # Configure OpenAI API with one pooled async HTTP client shared by every agent,
+        # sized for the expected number of concurrent requests; HTTP/2 multiplexes
+        # concurrent requests over few connections, and idle connections stay open
+        # for 5 minutes so calls skip the TCP/TLS handshake
+        pool_size = int(os.getenv("LLM_POOL", "128"))
+        self.client = openai.AsyncOpenAI(
+            api_key=self.api_key,
+            http_client=httpx.AsyncClient(
+                http2=True,
+                limits=httpx.Limits(
+                    max_connections=pool_size,
+                    max_keepalive_connections=pool_size,
+                    keepalive_expiry=300
+                )
+            )
+        )
         
         # Default model
         self.model = "gpt-4o-mini"  # You can change this to gpt-4o, gpt-4-turbo, etc.
+        self.embedding_model = "text-embedding-3-small"
+        
+        # Bound concurrent and per-minute requests to stay under provider rate limits
+        self._semaphore = asyncio.Semaphore(int(os.getenv("LLM_MAX_CONCURRENCY", "8")))
+        # Each model has its own provider quota, so each gets its own limiter
+        self._max_requests_per_minute = float(os.getenv("LLM_MAX_REQUESTS_PER_MINUTE", "500"))
+        self._rate_limiters: Dict[str, AsyncRateLimiter] = {}
+        
+        # Identical requests currently awaiting a response, keyed by request hash
+        self._inflight: Dict[str, asyncio.Future] = {}
+        
+        # Raw responses, reused across runs for identical requests
+        self.cache_enabled = cache_enabled
+        self._response_cache = LRUCache(512)
+        
+        # Optional semantic layer: a prompt close enough in embedding space to a
+        # cached one reuses its response. Off unless a threshold is configured,
+        # since every exact-cache miss then costs an embedding request.
+        self._semantic_cache: Optional[SemanticCache] = None
+        self._semantic_cache_path = os.getenv("LLM_SEMANTIC_CACHE_PATH") or None
+        semantic_threshold = os.getenv("LLM_SEMANTIC_CACHE_THRESHOLD")
+        if cache_enabled and semantic_threshold:
+            if self._semantic_cache_path:
+                self._semantic_cache = SemanticCache.load(self._semantic_cache_path, float(semantic_threshold), 1024)
+            else:
+                self._semantic_cache = SemanticCache(float(semantic_threshold), 1024)
+        
+        # Parsed structured responses, reused across runs for identical requests
+        self._structured_cache = LRUCache(int(os.getenv("LLM_CACHE_SIZE", "10000")))
+        
+        # (checked at, outcome) of the last validate_api_connection call
+        self._last_validation: Optional[Tuple[float, bool]] = None
         
         logger.info("OpenAI API service initialized successfully")
     
+    @asynccontextmanager
+    async def _request_slot(self, model: str):
+        """
+        Wait for a free concurrency slot and rate-limit token before an API request.
+        
+        Shared by every agent through the service singleton, so fan-out from any
+        agent stays within the provider's limits.
+        
+        Args:
+            model: Model the request is sent to (rate limits are per model)
+        """
+        if model not in self._rate_limiters:
+            self._rate_limiters[model] = AsyncRateLimiter(self._max_requests_per_minute, 60.0)
+        
+        async with self._semaphore:
+            await self._rate_limiters[model].acquire()
+            yield
+    
+    def _request_key(
+        self, 
+        prompt: str, 
+        system_prompt: str, 
+        temperature: float, 
+        max_tokens: int,
+        json_mode: bool = False
+    ) -> str:
+        """Hash the inputs that determine a completion."""
+        return _cache_key(self.model, temperature, max_tokens, json_mode, system_prompt, prompt)
+    
     async def generate_response(
         self, 
         prompt: str, 
         system_prompt: str = "",
         temperature: float = 0.7,
-        max_tokens: int = 2048
+        max_tokens: int = 2048,
+        json_mode: bool = False,
+        cache_namespace: str = "",
+        cache_text: str = ""
     ) -> str:
         """
         Generate a response from OpenAI API asynchronously.
@@ -51,6 +175,12 @@ class OpenAIAPIService:
             system_prompt: Optional system prompt for context
             temperature: Controls randomness (0.0 to 2.0)
             max_tokens: Maximum tokens in response
+            json_mode: Constrain the model to emit a single JSON object
+            cache_namespace: Semantic cache partition; prompts that must never
+                answer for each other (e.g. different sections) use different ones
+            cache_text: What the semantic cache compares instead of the whole
+                prompt, i.e. the parts that vary between requests (task, context,
+                summaries); the fixed template text would only dilute the match
             
         Returns:
             Generated response text
@@ -58,6 +188,84 @@ class OpenAIAPIService:
         Raises:
             Exception: If API call fails
         """
+        key = self._request_key(prompt, system_prompt, temperature, max_tokens, json_mode)
+        request_cache = _request_cache.get()
+        if request_cache is not None and key in request_cache:
+            logger.info("Reusing response from the current request scope")
+            return request_cache[key]
+        
+        if self.cache_enabled:
+            cached = await self._response_cache.get(key)
+            if cached is not None:
+                logger.info("Reusing cached response")
+                return cached
+        
+        vector = None
+        if self._semantic_cache is not None and temperature < SEMANTIC_CACHE_MAX_TEMPERATURE:
+            namespace = _cache_key(self.model, max_tokens, json_mode, cache_namespace, system_prompt)
+            try:
+                vector = await self.generate_embedding(cache_text or prompt)
+                cached = self._semantic_cache.search(vector, namespace)
+            except Exception as e:
+                # The semantic cache is an optimization; carry on without it
+                logger.warning(f"Semantic cache lookup failed: {e}")
+                vector = cached = None
+            if cached is not None:
+                logger.info("Reusing response to a semantically similar prompt")
+                return cached
+        
+        # Single-flight: an identical request already on the wire is awaited
+        # instead of being sent again
+        loop = asyncio.get_running_loop()
+        inflight = self._inflight.get(key)
+        while inflight is not None and inflight.get_loop() is loop:
+            logger.info("Joining an identical in-flight request")
+            try:
+                return await asyncio.shield(inflight)
+            except InflightCancelled:
+                # The caller sending it was cancelled; join a retry or send one
+                inflight = self._inflight.get(key)
+        
+        future = loop.create_future()
+        self._inflight[key] = future
+        try:
+            content = await self._complete(prompt, system_prompt, temperature, max_tokens, json_mode)
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the exception retrieved in case no other caller joined
+            future.exception()
+            raise
+        except BaseException:
+            # Hand the request back to any joiners instead of cancelling them too
+            future.set_exception(InflightCancelled())
+            future.exception()
+            raise
+        else:
+            future.set_result(content)
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+        
+        if self.cache_enabled:
+            await self._response_cache.set(key, content)
+        if vector is not None:
+            try:
+                self._semantic_cache.put(key, content, vector, namespace)
+            except Exception as e:
+                logger.warning(f"Semantic cache update failed: {e}")
+        if request_cache is not None:
+            request_cache[key] = content
+        return content
+    
+    async def _complete(
+        self, 
+        prompt: str, 
+        system_prompt: str, 
+        temperature: float, 
+        max_tokens: int, 
+        json_mode: bool
+    ) -> str:
+        """Send one chat completion request and return its text."""
         try:
             # Prepare messages
             messages = []
@@ -65,17 +273,14 @@ class OpenAIAPIService:
                 messages.append({"role": "system", "content": system_prompt})
             messages.append({"role": "user", "content": prompt})
             
-            # Run the API call in a thread pool to make it async
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                None,
-                lambda: self.client.chat.completions.create(
+            async with self._request_slot(self.model):
+                response = await self.client.chat.completions.create(
                     model=self.model,
                     messages=messages,
                     temperature=temperature,
-                    max_tokens=max_tokens
+                    max_tokens=max_tokens,
+                    **({"response_format": {"type": "json_object"}} if json_mode else {})
                 )
-            )
             
             if response.choices and response.choices[0].message.content:
                 content = response.choices[0].message.content
@@ -93,7 +298,11 @@ class OpenAIAPIService:
         prompt: str, 
         system_prompt: str = "",
         expected_format: str = "JSON",
-        temperature: float = 0.3
+        temperature: float = 0.3,
+        max_tokens: int = 2048,
+        json_mode: bool = False,
+        cache_namespace: str = "",
+        cache_text: str = ""
     ) -> Dict[str, Any]:
         """
         Generate a structured response (JSON) from OpenAI API.
@@ -103,63 +312,441 @@ class OpenAIAPIService:
             system_prompt: Optional system prompt for context
             expected_format: Expected response format (default: JSON)
             temperature: Controls randomness (0.0 to 2.0)
+            max_tokens: Maximum tokens in response
+            json_mode: Constrain the model to emit a single JSON object
+            cache_namespace: Semantic cache partition (see generate_response)
+            cache_text: Variable part of the prompt for the semantic cache (see generate_response)
             
         Returns:
             Parsed structured response
         """
+        # Add format instructions to the prompt
+        format_prompt = add_format_instruction(prompt, expected_format)
+        
+        # The format instruction is part of the prompt, so the raw request's
+        # key also identifies its parsed result
+        key = self._request_key(format_prompt, system_prompt, temperature, max_tokens, json_mode)
+        if self.cache_enabled:
+            cached = await self._structured_cache.get(key)
+            if cached is not None:
+                logger.info("Reusing cached structured response")
+                return cached
+        
         try:
-            # Add format instructions to the prompt
-            format_prompt = f"{prompt}\n\nPlease respond in {expected_format} format."
-            
             response_text = await self.generate_response(
                 format_prompt, 
                 system_prompt, 
-                temperature
+                temperature,
+                max_tokens,
+                json_mode,
+                cache_namespace,
+                cache_text
             )
             
-            # Try to parse as JSON if that's the expected format
-            if expected_format.upper() == "JSON":
-                import json
-                try:
-                    # Clean the response to extract JSON
-                    response_text = response_text.strip()
-                    if response_text.startswith("```json"):
-                        response_text = response_text[7:]
-                    if response_text.endswith("```"):
-                        response_text = response_text[:-3]
-                    
-                    return json.loads(response_text)
-                except json.JSONDecodeError as e:
-                    logger.warning(f"Failed to parse JSON response: {e}")
-                    # Return as text if JSON parsing fails
-                    return {"response": response_text}
-            
-            return {"response": response_text}
+            result, parsed = self._parse_structured(response_text, expected_format)
+            if not parsed:
+                # Don't let a malformed completion answer later identical requests
+                await self._forget_response(key)
+            elif self.cache_enabled:
+                await self._structured_cache.set(key, result)
+            return result
             
         except Exception as e:
             logger.error(f"Structured response generation failed: {e}")
             raise
     
+    async def generate_batch(
+        self, 
+        prompts: List[str], 
+        system_prompt: str = "",
+        temperature: float = 0.7,
+        max_tokens: int = 2048,
+        priority: str = "interactive"
+    ) -> List[Union[str, Exception]]:
+        """
+        Generate responses to independent prompts concurrently.
+        
+        Args:
+            prompts: User prompts, all sent with the same system prompt and settings
+            system_prompt: Optional system prompt for context
+            temperature: Controls randomness (0.0 to 2.0)
+            max_tokens: Maximum tokens in each response
+            priority: "interactive" sends real-time requests; "batch" submits the
+                prompts through the Batch API (half the cost, own quota, but may
+                take hours) and is meant for background jobs
+            
+        Returns:
+            One response text per prompt, in prompt order; a failed prompt's
+            entry is its exception
+        """
+        if priority == "batch":
+            return await self.generate_batch_offline(prompts, system_prompt, temperature, max_tokens)
+        
+        return await asyncio.gather(
+            *(self.generate_response(prompt, system_prompt, temperature, max_tokens) for prompt in prompts),
+            return_exceptions=True
+        )
+    
+    async def generate_batch_offline(
+        self, 
+        prompts: List[str], 
+        system_prompt: str = "",
+        temperature: float = 0.7,
+        max_tokens: int = 2048,
+        poll_interval: float = 30.0
+    ) -> List[Union[str, Exception]]:
+        """
+        Generate responses through the OpenAI Batch API and wait for them.
+        
+        The prompts are uploaded as one JSONL file and submitted as a batch,
+        which is then polled until it finishes.
+        
+        Args:
+            prompts: User prompts, all sent with the same system prompt and settings
+            system_prompt: Optional system prompt for context
+            temperature: Controls randomness (0.0 to 2.0)
+            max_tokens: Maximum tokens in each response
+            poll_interval: Seconds between batch status checks
+            
+        Returns:
+            One response text per prompt, in prompt order; a failed prompt's
+            entry is its exception
+            
+        Raises:
+            Exception: If the batch cannot be submitted or does not complete
+        """
+        messages = [{"role": "system", "content": system_prompt}] if system_prompt else []
+        lines = [
+            orjson.dumps({
+                "custom_id": str(i),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": self.model,
+                    "messages": messages + [{"role": "user", "content": prompt}],
+                    "temperature": temperature,
+                    "max_tokens": max_tokens
+                }
+            })
+            for i, prompt in enumerate(prompts)
+        ]
+        
+        try:
+            batch_file = await self.client.files.create(
+                file=("batch.jsonl", b"\n".join(lines)),
+                purpose="batch"
+            )
+            batch = await self.client.batches.create(
+                input_file_id=batch_file.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h"
+            )
+            logger.info(f"Submitted batch {batch.id} with {len(prompts)} requests")
+            
+            while batch.status not in ("completed", "failed", "expired", "cancelled"):
+                await asyncio.sleep(poll_interval)
+                batch = await self.client.batches.retrieve(batch.id)
+            
+            if batch.status != "completed":
+                raise Exception(f"batch {batch.id} ended with status {batch.status}")
+            
+            output = await self.client.files.content(batch.output_file_id) if batch.output_file_id else None
+        except Exception as e:
+            logger.error(f"OpenAI batch failed: {e}")
+            raise Exception(f"Failed to generate batch: {str(e)}")
+        
+        responses: Dict[str, str] = {}
+        for line in (output.text.splitlines() if output else []):
+            record = orjson.loads(line)
+            response = record.get("response") or {}
+            if response.get("status_code") == 200:
+                responses[record["custom_id"]] = response["body"]["choices"][0]["message"]["content"]
+        
+        logger.info(f"Batch {batch.id} completed ({len(responses)}/{len(prompts)} succeeded)")
+        return [
+            responses[str(i)] if str(i) in responses else Exception("Batch request failed")
+            for i in range(len(prompts))
+        ]
+    
+    async def generate_structured_batch(
+        self, 
+        prompts: List[str], 
+        system_prompt: str = "",
+        expected_format: str = "JSON",
+        temperature: float = 0.3
+    ) -> List[Union[Dict[str, Any], Exception]]:
+        """
+        Generate structured responses to independent prompts concurrently.
+        
+        Args:
+            prompts: User prompts, all sent with the same system prompt and settings
+            system_prompt: Optional system prompt for context
+            expected_format: Expected response format (default: JSON)
+            temperature: Controls randomness (0.0 to 2.0)
+            
+        Returns:
+            One parsed response per prompt, in prompt order; a failed prompt's
+            entry is its exception
+        """
+        return await asyncio.gather(
+            *(
+                self.generate_structured_response(prompt, system_prompt, expected_format, temperature)
+                for prompt in prompts
+            ),
+            return_exceptions=True
+        )
+    
+    async def generate_structured_sections(
+        self, 
+        prompt: str, 
+        sections: List[List[str]], 
+        system_prompt: str = "", 
+        temperature: float = 0.3,
+        cache_text: str = ""
+    ) -> Dict[str, Any]:
+        """
+        Generate independent parts of a structured response in parallel.
+        
+        Each group of top-level keys is requested with its own call and all calls
+        are in flight at once, so the response takes roughly as long as the
+        slowest group instead of one call producing every key.
+        
+        Args:
+            prompt: The user prompt shared by every group
+            sections: Groups of top-level keys to request together
+            system_prompt: Optional system prompt for context
+            temperature: Controls randomness (0.0 to 2.0)
+            cache_text: Variable part of the prompt for the semantic cache (see generate_response)
+        
+        Returns:
+            Merged structured response
+        
+        Raises:
+            Exception: If every group fails
+        """
+        tasks = [
+            self.generate_structured_response(
+                prompt=f"{prompt}\n\nOnly include these top-level keys in your response: {', '.join(keys)}.",
+                system_prompt=system_prompt,
+                temperature=temperature,
+                cache_namespace=",".join(keys),
+                cache_text=cache_text
+            )
+            for keys in sections
+        ]
+        parts = await asyncio.gather(*tasks, return_exceptions=True)
+        
+        merged: Dict[str, Any] = {}
+        errors = []
+        for keys, part in zip(sections, parts):
+            if isinstance(part, Exception):
+                logger.warning(f"Structured section {keys} failed: {part}")
+                errors.append(part)
+                continue
+            merged.update(part)
+        
+        if len(errors) == len(sections):
+            raise Exception(f"Failed to generate structured sections: {str(errors[0])}")
+        return merged
+    
+    async def stream_response(
+        self, 
+        prompt: str, 
+        system_prompt: str = "",
+        temperature: float = 0.7,
+        max_tokens: int = 2048
+    ) -> AsyncIterator[str]:
+        """
+        Stream a response from OpenAI API as it is generated.
+        
+        Args:
+            prompt: The user prompt
+            system_prompt: Optional system prompt for context
+            temperature: Controls randomness (0.0 to 2.0)
+            max_tokens: Maximum tokens in response
+            
+        Yields:
+            Text chunks in the order they are produced
+            
+        Raises:
+            Exception: If API call fails
+        """
+        request_cache = _request_cache.get()
+        if request_cache is not None:
+            key = self._request_key(prompt, system_prompt, temperature, max_tokens)
+            if key in request_cache:
+                logger.info("Reusing response from the current request scope")
+                yield request_cache[key]
+                return
+        
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+        
+        parts = []
+        async with self._request_slot(self.model):
+            try:
+                stream = await self.client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    stream=True
+                )
+            except Exception as e:
+                logger.error(f"OpenAI API stream failed: {e}")
+                raise Exception(f"Failed to stream response: {str(e)}")
+            
+            try:
+                async for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        parts.append(chunk.choices[0].delta.content)
+                        yield chunk.choices[0].delta.content
+            except Exception as e:
+                logger.error(f"OpenAI API stream failed: {e}")
+                raise Exception(f"Failed to stream response: {str(e)}")
+            finally:
+                # Release the connection if the consumer stopped early
+                await stream.response.aclose()
+        
+        content = "".join(parts)
+        logger.info(f"Streamed response successfully ({len(content)} characters)")
+        if request_cache is not None:
+            request_cache[key] = content
+    
+    async def stream_structured_response(
+        self, 
+        prompt: str, 
+        system_prompt: str = "",
+        expected_format: str = "JSON",
+        temperature: float = 0.3
+    ) -> AsyncIterator[str]:
+        """
+        Stream the raw text of a structured response from OpenAI API.
+        
+        The joined chunks can be handed to parse_structured_response once
+        the stream is exhausted.
+        
+        Args:
+            prompt: The user prompt
+            system_prompt: Optional system prompt for context
+            expected_format: Expected response format (default: JSON)
+            temperature: Controls randomness (0.0 to 2.0)
+            
+        Yields:
+            Text chunks in the order they are produced
+        """
+        format_prompt = add_format_instruction(prompt, expected_format)
+        
+        async for chunk in self.stream_response(format_prompt, system_prompt, temperature):
+            yield chunk
+    
+    async def generate_embedding(self, text: str) -> List[float]:
+        """
+        Generate an embedding vector for the given text.
+        
+        Args:
+            text: Text to embed
+            
+        Returns:
+            Embedding vector
+            
+        Raises:
+            Exception: If API call fails
+        """
+        try:
+            async with self._request_slot(self.embedding_model):
+                response = await self.client.embeddings.create(
+                    model=self.embedding_model,
+                    input=text
+                )
+            return response.data[0].embedding
+            
+        except Exception as e:
+            logger.error(f"OpenAI embedding call failed: {e}")
+            raise Exception(f"Failed to generate embedding: {str(e)}")
+    
+    def parse_structured_response(
+        self, 
+        response_text: str, 
+        expected_format: str = "JSON"
+    ) -> Dict[str, Any]:
+        """
+        Parse the raw text of a structured response.
+        
+        Args:
+            response_text: Raw response text from the model
+            expected_format: Expected response format (default: JSON)
+            
+        Returns:
+            Parsed structured response
+        """
+        return self._parse_structured(response_text, expected_format)[0]
+    
+    def _parse_structured(self, response_text: str, expected_format: str) -> Tuple[Dict[str, Any], bool]:
+        """Parse a structured response, also reporting whether JSON parsing succeeded."""
+        # Try to parse as JSON if that's the expected format
+        if expected_format.upper() == "JSON":
+            try:
+                return parse_json_response(response_text), True
+            except orjson.JSONDecodeError as e:
+                logger.warning(f"Failed to parse JSON response: {e}")
+                # Return as text if JSON parsing fails
+                return {"response": response_text}, False
+        
+        return {"response": response_text}, True
+    
+    async def _forget_response(self, key: str) -> None:
+        """Drop a raw response from every cache that may hold it."""
+        await self._response_cache.delete(key)
+        request_cache = _request_cache.get()
+        if request_cache is not None:
+            request_cache.pop(key, None)
+        if self._semantic_cache is not None:
+            self._semantic_cache.discard(key)
+    
+    async def close(self) -> None:
+        """Close the pooled HTTP client and its open connections, saving the semantic cache."""
+        if self._semantic_cache is not None and self._semantic_cache_path:
+            self._semantic_cache.save(self._semantic_cache_path)
+        await self.client.close()
+        logger.info("OpenAI API service closed")
+    
     async def validate_api_connection(self) -> bool:
         """
         Validate that the OpenAI API is accessible and working.
         
+        Looks up the configured model rather than running a completion, and
+        reuses the outcome for VALIDATION_TTL_SECONDS.
+        
         Returns:
             True if connection is successful, False otherwise
         """
+        now = time.monotonic()
+        if self._last_validation is not None and now - self._last_validation[0] < VALIDATION_TTL_SECONDS:
+            return self._last_validation[1]
+        
         try:
-            test_response = await self.generate_response(
-                "Hello, please respond with 'API is working' if you can see this message.",
-                temperature=0.1
-            )
-            return "API is working" in test_response or len(test_response) > 0
+            await self.client.models.retrieve(self.model)
+            valid = True
         except Exception as e:
             logger.error(f"API validation failed: {e}")
-            return False
+            valid = False
+        
+        self._last_validation = (now, valid)
+        return valid
 
 # Global instance for reuse across agents
 openai_service = None
 
+async def close_openai_service() -> None:
+    """Close the global OpenAI API service instance, if one was created."""
+    global openai_service
+    if openai_service is not None:
+        await openai_service.close()
+        openai_service = None
+
 def get_openai_service() -> OpenAIAPIService:
     """
     Get or create a global OpenAI API service instance.
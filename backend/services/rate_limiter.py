@@ -0,0 +1,60 @@
+"""
+Rate Limiter Module
+Token-bucket rate limiting for outgoing LLM API requests.
+"""
+
+import asyncio
+import time
+from typing import Callable
+
+
+class AsyncRateLimiter:
+    """
+    Token-bucket limiter allowing at most `max_rate` requests per `time_period` seconds.
+
+    Tokens refill continuously, so bursts up to `max_rate` are allowed and the
+    sustained rate never exceeds the configured limit.
+    """
+
+    def __init__(
+        self,
+        max_rate: float,
+        time_period: float = 60.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            max_rate: Number of requests allowed per time period
+            time_period: Length of the time period in seconds
+            clock: Monotonic time source in seconds
+        """
+        self.max_rate = max_rate
+        self.time_period = time_period
+        self._clock = clock
+        self._tokens = float(max_rate)
+        self._last_refill = clock()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until a request may be sent, then consume one token."""
+        async with self._lock:
+            while True:
+                now = self._clock()
+                elapsed = now - self._last_refill
+                self._tokens = min(self.max_rate, self._tokens + elapsed * self.max_rate / self.time_period)
+                self._last_refill = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self._tokens) * self.time_period / self.max_rate)
+
+    async def __aenter__(self) -> "AsyncRateLimiter":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        return None
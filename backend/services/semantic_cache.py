@@ -0,0 +1,172 @@
+"""
+Semantic Cache Module
+Reuses results for requests that are identical or close in embedding space.
+"""
+
+import os
+import pickle
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+
+
+class SemanticCache:
+    """
+    Result cache with exact-key and cosine-similarity lookups.
+
+    Entries are evicted with GreedyDual-Size-Frequency: each entry's priority is
+    `clock + hits * cost / size`, the lowest-priority entry is dropped when the
+    cache is full and the clock advances to its priority. Expensive, frequently
+    reused results therefore outlive cheap or one-off ones, which plain LRU
+    does not account for.
+    """
+
+    def __init__(self, threshold: float = 0.95, capacity: int = 256):
+        """
+        Initialize the cache.
+
+        Args:
+            threshold: Minimum cosine similarity for a semantic hit
+            capacity: Maximum number of entries before eviction
+        """
+        self.threshold = threshold
+        self.capacity = capacity
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._clock = 0.0
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the value stored under `key`, or None on a miss."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._touch(entry)
+        return entry["value"]
+
+    def search(self, vector: Sequence[float], namespace: str = "") -> Optional[Any]:
+        """
+        Return the most similar value in `namespace` if it clears the threshold.
+
+        Args:
+            vector: Embedding of the request
+            namespace: Only entries stored with the same namespace are compared
+
+        Returns:
+            Cached value, or None if nothing is similar enough
+        """
+        candidates = [
+            entry for entry in self._entries.values()
+            if entry["namespace"] == namespace and entry["vector"] is not None
+        ]
+        if not candidates:
+            return None
+
+        similarities = np.stack([entry["vector"] for entry in candidates]) @ self.normalize(vector)
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.threshold:
+            return None
+
+        self._touch(candidates[best])
+        return candidates[best]["value"]
+
+    def put(
+        self,
+        key: str,
+        value: Any,
+        vector: Optional[Sequence[float]] = None,
+        namespace: str = "",
+        cost: float = 1.0,
+        size: float = 1.0
+    ) -> None:
+        """
+        Store a value, evicting the lowest-priority entries if the cache is full.
+
+        Args:
+            key: Exact-match key
+            value: Value to cache
+            vector: Embedding of the request; without one the entry is exact-match only
+            namespace: Partition the entry is searched in
+            cost: Cost of recomputing the value (e.g. seconds taken)
+            size: Relative size of the value
+        """
+        entry = {
+            "value": value,
+            "vector": self.normalize(vector) if vector is not None else None,
+            "namespace": namespace,
+            "cost": max(cost, 1e-6),
+            "size": max(size, 1e-6),
+            "hits": 0
+        }
+        self._entries[key] = entry
+        self._touch(entry)
+
+        while len(self._entries) > self.capacity:
+            victim = min(self._entries, key=lambda k: self._entries[k]["priority"])
+            self._clock = self._entries.pop(victim)["priority"]
+
+    def discard(self, key: str) -> None:
+        """Drop the entry stored under `key`, if there is one."""
+        self._entries.pop(key, None)
+
+    def _touch(self, entry: Dict[str, Any]) -> None:
+        """Record a use of an entry and refresh its priority."""
+        entry["hits"] += 1
+        entry["priority"] = self._clock + entry["hits"] * entry["cost"] / entry["size"]
+
+    @staticmethod
+    def normalize(vector: Sequence[float]) -> np.ndarray:
+        """Return `vector` scaled to unit length."""
+        array = np.asarray(vector, dtype=np.float32)
+        return array / np.linalg.norm(array)
+
+    def save(self, path: str) -> None:
+        """
+        Write the cache to disk so it survives restarts.
+
+        Vectors go to `<path>.npy` and everything else to a `<path>.pkl` sidecar.
+
+        Args:
+            path: File path prefix
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        vector_keys = [key for key, entry in self._entries.items() if entry["vector"] is not None]
+        if vector_keys:
+            np.save(f"{path}.npy", np.stack([self._entries[key]["vector"] for key in vector_keys]))
+        state = {
+            "clock": self._clock,
+            "vector_keys": vector_keys,
+            "entries": {
+                key: {field: value for field, value in entry.items() if field != "vector"}
+                for key, entry in self._entries.items()
+            }
+        }
+        with open(f"{path}.pkl", "wb") as f:
+            pickle.dump(state, f)
+
+    @classmethod
+    def load(cls, path: str, threshold: float = 0.95, capacity: int = 256) -> "SemanticCache":
+        """
+        Read a cache written by save(), or start an empty one if none exists.
+
+        Args:
+            path: File path prefix passed to save()
+            threshold: Minimum cosine similarity for a semantic hit
+            capacity: Maximum number of entries before eviction
+
+        Returns:
+            SemanticCache instance
+        """
+        cache = cls(threshold, capacity)
+        if not os.path.exists(f"{path}.pkl"):
+            return cache
+
+        with open(f"{path}.pkl", "rb") as f:
+            state = pickle.load(f)
+        vectors = np.load(f"{path}.npy") if state["vector_keys"] else []
+        cache._clock = state["clock"]
+        cache._entries = {key: dict(entry, vector=None) for key, entry in state["entries"].items()}
+        for key, vector in zip(state["vector_keys"], vectors):
+            cache._entries[key]["vector"] = vector
+        return cache
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,47 @@
+"""
+LLM Service Test Doubles
+Offline stand-ins for the OpenAI service, for tests and the agents' offline
+self-check (validate_agent). Nothing on a request path imports this module.
+"""
+
+import copy
+from typing import Dict, Any, List
+
+
+class FakeLLMService:
+    """
+    Drop-in replacement for OpenAIAPIService that never touches the network.
+
+    Every structured request returns a copy of the same canned response, which
+    lets agents be exercised end to end (prompt building, parsing, metadata)
+    without spending an API call.
+    """
+
+    def __init__(self, response: Dict[str, Any]):
+        """
+        Initialize the fake service.
+
+        Args:
+            response: Structured response returned for every request
+        """
+        self.response = response
+        self.calls = 0
+
+    async def generate_structured_response(self, prompt: str, system_prompt: str = "", **kwargs) -> Dict[str, Any]:
+        """Return a copy of the canned response."""
+        self.calls += 1
+        return copy.deepcopy(self.response)
+
+    async def generate_structured_sections(
+        self,
+        prompt: str,
+        sections: List[List[str]],
+        system_prompt: str = "",
+        **kwargs
+    ) -> Dict[str, Any]:
+        """Return a copy of the canned response, as if every section succeeded."""
+        return await self.generate_structured_response(prompt, system_prompt)
+
+    async def generate_structured_batch(self, prompts: List[str], system_prompt: str = "", **kwargs) -> List[Dict[str, Any]]:
+        """Return one copy of the canned response per prompt."""
+        return [await self.generate_structured_response(prompt, system_prompt) for prompt in prompts]
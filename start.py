@@ -4,6 +4,7 @@ Startup script for AI Agentic Workflow Orchestrator
 Provides a simple way to start the application with proper configuration.
 """
 
+import importlib.util
 import os
 import sys
 import subprocess
@@ -15,7 +16,7 @@ def check_environment():
     print("🔧 Checking environment...")
     
     # Check if .env exists
-    if not Path(".env").exists():
+    if not Path(".env").is_file():
         print("⚠️  .env file not found. Creating from template...")
         if Path("env.example").exists():
             subprocess.run(["cp", "env.example", ".env"])
@@ -49,7 +50,6 @@ def check_dependencies():
     
     required_packages = [
         ("streamlit", "streamlit"),
-        ("requests", "requests"), 
         ("python-dotenv", "dotenv"),
         ("openai", "openai"),
         ("pydantic", "pydantic")
@@ -57,9 +57,8 @@ def check_dependencies():
     
     missing_packages = []
     for package_name, import_name in required_packages:
-        try:
-            __import__(import_name)
-        except ImportError:
+        # Only locate the package; importing it would run its (slow) initialization
+        if importlib.util.find_spec(import_name) is None:
             missing_packages.append(package_name)
     
     if missing_packages:
@@ -0,0 +1,83 @@
+"""
+Tests for the LLM request dispatcher.
+"""
+
+import asyncio
+
+import pytest
+
+from backend.agents.dispatcher import Dispatcher
+
+
+def test_submit_returns_result():
+    async def main():
+        dispatcher = Dispatcher(workers=2)
+
+        async def double(x):
+            return x * 2
+
+        return await asyncio.gather(*(dispatcher.submit(double, i) for i in range(5)))
+
+    assert asyncio.run(main()) == [0, 2, 4, 6, 8]
+
+
+def test_submit_raises_request_error():
+    async def main():
+        dispatcher = Dispatcher(workers=1)
+
+        async def fail():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            await dispatcher.submit(fail)
+
+    asyncio.run(main())
+
+
+def test_cancelled_submitter_cancels_request_and_frees_worker():
+    async def main():
+        dispatcher = Dispatcher(workers=1)
+        started = asyncio.Event()
+        cancelled = asyncio.Event()
+
+        async def slow():
+            started.set()
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        async def quick():
+            return "done"
+
+        submitter = asyncio.create_task(dispatcher.submit(slow))
+        await started.wait()
+        submitter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await submitter
+
+        await asyncio.wait_for(cancelled.wait(), timeout=1)
+        # The only worker is free again
+        assert await asyncio.wait_for(dispatcher.submit(quick), timeout=1) == "done"
+
+    asyncio.run(main())
+
+
+def test_request_cancelled_from_inside_resolves_submitter_and_keeps_worker():
+    async def main():
+        dispatcher = Dispatcher(workers=1)
+
+        async def cancelled_inside():
+            raise asyncio.CancelledError()
+
+        async def quick():
+            return "done"
+
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.wait_for(dispatcher.submit(cancelled_inside), timeout=1)
+
+        assert await asyncio.wait_for(dispatcher.submit(quick), timeout=1) == "done"
+        assert all(not task.done() for task in dispatcher._tasks)
+
+    asyncio.run(main())
@@ -0,0 +1,36 @@
+"""
+Tests for the JSON response parser.
+"""
+
+import orjson
+import pytest
+
+from backend.services._json_util import parse_json_response
+
+
+def test_plain_json():
+    assert parse_json_response('{"a": 1}') == {"a": 1}
+
+
+def test_fenced_json():
+    assert parse_json_response('```json\n{"a": 1}\n```') == {"a": 1}
+
+
+def test_bare_fence():
+    assert parse_json_response('```\n[1, 2]\n```') == [1, 2]
+
+
+def test_fence_inside_string_is_kept():
+    payload = {"deliverables": [{"content": "```python\nprint(1)\n```"}]}
+    text = "```json\n" + orjson.dumps(payload).decode() + "\n```"
+    assert parse_json_response(text) == payload
+
+
+def test_prose_around_payload():
+    text = 'Here is the plan:\n```json\n{"steps": ["a"]}\n```\nLet me know.'
+    assert parse_json_response(text) == {"steps": ["a"]}
+
+
+def test_invalid_json_raises():
+    with pytest.raises(orjson.JSONDecodeError):
+        parse_json_response("no json here")
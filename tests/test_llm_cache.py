@@ -0,0 +1,62 @@
+"""
+Tests for the LRU response cache.
+"""
+
+import asyncio
+
+from backend.services.llm_cache import LRUCache
+
+
+def test_evicts_least_recently_used():
+    async def main():
+        cache = LRUCache(capacity=2)
+        await cache.set("a", 1)
+        await cache.set("b", 2)
+        # Reading "a" makes "b" the least recently used entry
+        assert await cache.get("a") == 1
+        await cache.set("c", 3)
+        return await cache.get("a"), await cache.get("b"), await cache.get("c"), len(cache)
+
+    assert asyncio.run(main()) == (1, None, 3, 2)
+
+
+def test_overwrite_does_not_grow_cache():
+    async def main():
+        cache = LRUCache(capacity=2)
+        await cache.set("a", 1)
+        await cache.set("a", 2)
+        return await cache.get("a"), len(cache)
+
+    assert asyncio.run(main()) == (2, 1)
+
+
+def test_values_are_copied_in_and_out():
+    async def main():
+        cache = LRUCache()
+        value = {"steps": ["one"]}
+        await cache.set("key", value)
+        # Mutating the stored original doesn't change the cached copy
+        value["steps"].append("two")
+
+        first = await cache.get("key")
+        # Neither does mutating what a caller got back
+        first["metadata"] = {"agent": "Research Agent"}
+        return first, await cache.get("key")
+
+    first, second = asyncio.run(main())
+    assert first == {"steps": ["one"], "metadata": {"agent": "Research Agent"}}
+    assert second == {"steps": ["one"]}
+
+
+def test_delete_and_clear():
+    async def main():
+        cache = LRUCache()
+        await cache.set("a", 1)
+        await cache.set("b", 2)
+        await cache.delete("a")
+        await cache.delete("missing")
+        deleted = await cache.get("a")
+        cache.clear()
+        return deleted, len(cache)
+
+    assert asyncio.run(main()) == (None, 0)
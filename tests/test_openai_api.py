@@ -0,0 +1,113 @@
+"""
+Tests for the OpenAI service's request coalescing and caches.
+
+The network call (_complete) is replaced, so no API key or connection is needed.
+"""
+
+import asyncio
+
+import pytest
+
+from backend.services.openai_api import OpenAIAPIService, request_scope
+from backend.services.semantic_cache import SemanticCache
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.delenv("LLM_SEMANTIC_CACHE_THRESHOLD", raising=False)
+    return OpenAIAPIService()
+
+
+def test_cancelled_leader_does_not_cancel_joiners(service):
+    calls = []
+    release = asyncio.Event()
+
+    async def complete(prompt, *args):
+        calls.append(prompt)
+        await release.wait()
+        return f"answer {len(calls)}"
+
+    service._complete = complete
+
+    async def main():
+        leader = asyncio.create_task(service.generate_response("same prompt"))
+        await asyncio.sleep(0)
+        joiners = [asyncio.create_task(service.generate_response("same prompt")) for _ in range(2)]
+        await asyncio.sleep(0)
+
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        await asyncio.sleep(0)
+        release.set()
+        return await asyncio.gather(*joiners)
+
+    # One joiner re-sends the request and the other joins that retry
+    assert asyncio.run(main()) == ["answer 2", "answer 2"]
+    assert len(calls) == 2
+    assert service._inflight == {}
+
+
+def test_failed_leader_is_removed_from_inflight(service):
+    calls = []
+
+    async def complete(prompt, *args):
+        calls.append(prompt)
+        await asyncio.sleep(0)
+        if len(calls) == 1:
+            raise Exception("Failed to generate response: boom")
+        return "recovered"
+
+    service._complete = complete
+
+    async def main():
+        results = await asyncio.gather(
+            service.generate_response("same prompt"),
+            service.generate_response("same prompt"),
+            return_exceptions=True
+        )
+        # Both callers shared the failed request
+        assert len(calls) == 1
+        assert all(isinstance(result, Exception) for result in results)
+        assert service._inflight == {}
+
+        # The next identical request is sent again rather than joining the failure
+        return await service.generate_response("same prompt")
+
+    assert asyncio.run(main()) == "recovered"
+    assert len(calls) == 2
+
+
+def test_unparseable_structured_response_is_not_cached(service):
+    responses = iter(["not json", '{"answer": 42}'])
+    calls = []
+
+    async def complete(prompt, *args):
+        calls.append(prompt)
+        return next(responses)
+
+    async def embed(text):
+        return [1.0, 0.0]
+
+    service._complete = complete
+    service.generate_embedding = embed
+    service._semantic_cache = SemanticCache(threshold=0.9)
+
+    async def main():
+        with request_scope():
+            first = await service.generate_structured_response("What is the answer?")
+            # The malformed text is gone from the raw, request-scope and semantic caches
+            assert len(service._response_cache) == 0
+            assert len(service._semantic_cache) == 0
+            assert len(service._structured_cache) == 0
+
+            second = await service.generate_structured_response("What is the answer?")
+            third = await service.generate_structured_response("What is the answer?")
+        return first, second, third
+
+    first, second, third = asyncio.run(main())
+    assert first == {"response": "not json"}
+    assert second == third == {"answer": 42}
+    # Only the failed parse was retried
+    assert len(calls) == 2
@@ -0,0 +1,80 @@
+"""
+Tests for the token-bucket rate limiter, driven by a fake clock.
+"""
+
+import asyncio
+
+import pytest
+
+from backend.services import rate_limiter
+from backend.services.rate_limiter import AsyncRateLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limiter.asyncio, "sleep", clock.sleep)
+    return clock
+
+
+def _acquire(limiter, times):
+    async def main():
+        for _ in range(times):
+            await limiter.acquire()
+
+    asyncio.run(main())
+
+
+def test_allows_a_burst_up_to_the_limit(clock):
+    limiter = AsyncRateLimiter(5, 60.0, clock=clock)
+    _acquire(limiter, 5)
+    assert clock.sleeps == []
+
+
+def test_waits_for_the_next_token(clock):
+    limiter = AsyncRateLimiter(5, 60.0, clock=clock)
+    _acquire(limiter, 6)
+    # One token refills every 12 seconds
+    assert clock.sleeps == [pytest.approx(12.0)]
+    assert clock.now == pytest.approx(12.0)
+
+
+def test_tokens_refill_over_time(clock):
+    limiter = AsyncRateLimiter(5, 60.0, clock=clock)
+    _acquire(limiter, 5)
+    clock.now += 24.0
+    _acquire(limiter, 2)
+    assert clock.sleeps == []
+
+
+def test_refill_is_capped_at_the_burst_size(clock):
+    limiter = AsyncRateLimiter(5, 60.0, clock=clock)
+    clock.now += 600.0
+    _acquire(limiter, 6)
+    assert clock.sleeps == [pytest.approx(12.0)]
+
+
+def test_works_as_a_context_manager(clock):
+    limiter = AsyncRateLimiter(1, 1.0, clock=clock)
+
+    async def main():
+        async with limiter:
+            pass
+        async with limiter:
+            pass
+
+    asyncio.run(main())
+    assert clock.sleeps == [pytest.approx(1.0)]
@@ -0,0 +1,98 @@
+"""
+Tests for the semantic cache, using small hand-made embeddings.
+"""
+
+from backend.services.semantic_cache import SemanticCache
+
+
+def test_exact_get():
+    cache = SemanticCache()
+    cache.put("key", "value")
+    assert cache.get("key") == "value"
+    assert cache.get("other") is None
+
+
+def test_search_matches_similar_vectors_only():
+    cache = SemanticCache(threshold=0.9)
+    cache.put("a", "about cats", [1.0, 0.0, 0.0])
+    cache.put("b", "about dogs", [0.0, 1.0, 0.0])
+    # Scale doesn't matter, direction does
+    assert cache.search([10.0, 1.0, 0.0]) == "about cats"
+    assert cache.search([0.1, 1.0, 0.0]) == "about dogs"
+    assert cache.search([1.0, 1.0, 0.0]) is None
+
+
+def test_search_is_partitioned_by_namespace():
+    cache = SemanticCache(threshold=0.9)
+    cache.put("a", "research", [1.0, 0.0], namespace="research")
+    assert cache.search([1.0, 0.0], namespace="planning") is None
+    assert cache.search([1.0, 0.0], namespace="research") == "research"
+
+
+def test_entries_without_vectors_are_exact_match_only():
+    cache = SemanticCache(threshold=0.5)
+    cache.put("a", "value")
+    assert cache.search([1.0, 0.0]) is None
+
+
+def test_evicts_lowest_priority_entry():
+    cache = SemanticCache(capacity=2)
+    cache.put("cheap", "c", cost=1.0)
+    cache.put("expensive", "e", cost=10.0)
+    cache.put("new", "n", cost=2.0)
+    # GDSF drops the entry with the lowest hits * cost / size first
+    assert cache.get("cheap") is None
+    assert cache.get("expensive") == "e"
+    assert cache.get("new") == "n"
+
+
+def test_hits_protect_entries_from_eviction():
+    cache = SemanticCache(capacity=2)
+    cache.put("popular", "p", cost=1.0)
+    cache.put("once", "o", cost=1.5)
+    for _ in range(3):
+        cache.get("popular")
+    cache.put("new", "n", cost=2.0)
+    assert cache.get("once") is None
+    assert cache.get("popular") == "p"
+
+
+def test_clock_ages_out_stale_entries():
+    cache = SemanticCache(capacity=2)
+    cache.put("stale", "s", cost=3.0)
+    # Without aging, cheaper entries would never displace the expensive one;
+    # each eviction advances the clock until new entries outrank it
+    for i in range(8):
+        cache.put(f"cheap-{i}", i, cost=1.0)
+    assert cache.get("stale") is None
+    assert cache._clock >= 2.0
+
+
+def test_discard():
+    cache = SemanticCache()
+    cache.put("key", "value", [1.0, 0.0])
+    cache.discard("key")
+    cache.discard("missing")
+    assert len(cache) == 0
+    assert cache.search([1.0, 0.0]) is None
+
+
+def test_save_and_load_round_trip(tmp_path):
+    path = str(tmp_path / "cache" / "semantic")
+    cache = SemanticCache(threshold=0.9)
+    cache.put("a", {"answer": 1}, [1.0, 0.0], namespace="n", cost=3.0)
+    cache.put("b", "exact only")
+    cache.save(path)
+
+    loaded = SemanticCache.load(path, threshold=0.9)
+    assert len(loaded) == 2
+    assert loaded.search([2.0, 0.1], namespace="n") == {"answer": 1}
+    assert loaded.get("b") == "exact only"
+    assert loaded._clock == cache._clock
+
+
+def test_load_without_saved_cache_starts_empty(tmp_path):
+    loaded = SemanticCache.load(str(tmp_path / "missing"), threshold=0.8, capacity=3)
+    assert len(loaded) == 0
+    assert loaded.threshold == 0.8
+    assert loaded.capacity == 3
@@ -0,0 +1,61 @@
+"""
+Tests for the incremental JSON member scanner used by streamed agent output.
+"""
+
+import asyncio
+
+import pytest
+
+from backend.agents.streaming import iter_json_members
+
+
+async def _chunks(text, size):
+    for i in range(0, len(text), size):
+        yield text[i:i + size]
+
+
+def _members(text, size=3):
+    async def collect():
+        return [member async for member in iter_json_members(_chunks(text, size))]
+
+    return asyncio.run(collect())
+
+
+def test_members_in_order():
+    assert _members('{"a": 1, "b": [1, 2], "c": {"d": null}}') == [("a", 1), ("b", [1, 2]), ("c", {"d": None})]
+
+
+def test_single_character_chunks():
+    assert _members('{"a": {"b": [{"c": 1}]}, "d": "e"}', size=1) == [("a", {"b": [{"c": 1}]}), ("d", "e")]
+
+
+def test_braces_and_commas_inside_strings():
+    text = '{"code": "if (x) { return [a, b]; }", "next": "}"}'
+    assert _members(text) == [("code", "if (x) { return [a, b]; }"), ("next", "}")]
+
+
+def test_escaped_quotes_inside_strings():
+    text = r'{"quote": "she said \"{hi}\"", "path": "C:\\", "after": 1}'
+    assert _members(text) == [("quote", 'she said "{hi}"'), ("path", "C:\\"), ("after", 1)]
+
+
+def test_text_around_code_fence_is_ignored():
+    text = 'Here you go:\n```json\n{"a": 1}\n```\nAnything else?'
+    assert _members(text) == [("a", 1)]
+
+
+def test_truncated_object_raises():
+    async def collect():
+        members = []
+        with pytest.raises(ValueError):
+            async for member in iter_json_members(_chunks('{"a": 1, "b": {"c": [1, 2', 4)):
+                members.append(member)
+        return members
+
+    # Members closed before the cut-off are still yielded
+    assert asyncio.run(collect()) == [("a", 1)]
+
+
+def test_missing_object_raises():
+    with pytest.raises(ValueError):
+        _members("no json here")
@@ -0,0 +1,60 @@
+"""
+Tests for the research and planning summaries handed between agents.
+"""
+
+from backend.agents._summaries import summarize_planning, summarize_research
+
+
+def test_research_summary():
+    summary = summarize_research({
+        "task_analysis": {"main_objective": "Ship it", "key_domains": ["web", "ops"], "complexity_level": "low"},
+        "research_questions": [{"question": "How?", "priority": "high"}],
+    })
+    assert "Main Objective: Ship it" in summary
+    assert "Key Domains: web, ops" in summary
+    assert "1. How? (high priority)" in summary
+
+
+def test_research_summary_limits_questions():
+    questions = [{"question": f"Q{i}", "priority": "low"} for i in range(10)]
+    summary = summarize_research({"research_questions": questions}, max_questions=2)
+    assert "Research Questions (10 total)" in summary
+    assert "2. Q1" in summary
+    assert "3. Q2" not in summary
+
+
+def test_research_summary_skips_empty_sections():
+    assert summarize_research({"research_questions": []}) == ""
+
+
+def test_malformed_research_results_degrade():
+    malformed = [
+        {"task_analysis": {"key_domains": ["web", 3]}},
+        {"task_analysis": "not a dict"},
+        {"research_questions": ["not a dict"]},
+        "not a dict",
+    ]
+    for results in malformed:
+        assert summarize_research(results) == "Research results available but summary extraction failed"
+
+
+def test_planning_summary():
+    summary = summarize_planning({
+        "execution_plan": {"overview": "Do it"},
+        "phases": [{"phase_number": 1, "phase_name": "Setup"}],
+        "detailed_steps": [{"title": "Install"}],
+    })
+    assert "Plan Overview: Do it" in summary
+    assert "- Phase 1: Setup" in summary
+    assert "1. Install" in summary
+
+
+def test_malformed_planning_results_degrade():
+    malformed = [
+        {"execution_plan": ["not a dict"]},
+        {"phases": [None]},
+        {"detailed_steps": 5},
+        None,
+    ]
+    for results in malformed:
+        assert summarize_planning(results) == "Planning results available but summary extraction failed"